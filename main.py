@@ -1,62 +1,85 @@
 #!/usr/bin/env python3
 """Main entry point for MCP Optimizer server."""
 
-import asyncio
 import logging
 import sys
+from typing import TYPE_CHECKING, Any
 
-from mcp_optimizer.config import TransportMode, settings
-from mcp_optimizer.mcp_server import create_mcp_server
+from mcp_optimizer.config import LogFormat, TransportMode, settings
+from mcp_optimizer.utils.log_format import CachedTimeFormatter, JsonFormatter
+from mcp_optimizer.utils.log_handler import BufferedStderrHandler
+
+if TYPE_CHECKING:
+    from fastmcp import FastMCP
+
+# Settings are not overridden after import here, so resolve logging options once
+_LOG_LEVEL = getattr(logging, settings.log_level.value)
+_LOG_JSON = settings.log_format == LogFormat.JSON
 
 
 def setup_logging() -> None:
     """Setup logging configuration."""
-    # Use centralized settings instead of direct os.getenv
-    log_level = settings.log_level.value
-
-    if settings.log_format.value == "json":
-        log_format = '{"timestamp": "%(asctime)s", "level": "%(levelname)s", "module": "%(name)s", "message": "%(message)s"}'
+    # Batch stderr writes instead of issuing one syscall per record
+    handler = BufferedStderrHandler()
+    if _LOG_JSON:
+        handler.setFormatter(JsonFormatter(datefmt="%Y-%m-%dT%H:%M:%S"))
     else:
-        log_format = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+        handler.setFormatter(
+            CachedTimeFormatter(
+                "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+                datefmt="%Y-%m-%dT%H:%M:%S",
+            )
+        )
 
-    logging.basicConfig(
-        level=getattr(logging, log_level),
-        format=log_format,
-        datefmt="%Y-%m-%dT%H:%M:%S",
-        handlers=[
-            logging.StreamHandler(sys.stderr),
-        ],
-    )
+    logging.basicConfig(level=_LOG_LEVEL, handlers=[handler])
 
 
 async def run_mcp_sse() -> None:
     """Run MCP server with SSE transport."""
+    from mcp_optimizer.mcp_server import create_mcp_server
+
     logging.info(f"Starting MCP SSE server on {settings.server_host}:{settings.server_port}")
     mcp = create_mcp_server()
 
-    # FastMCP SSE mode is actually async
-    await asyncio.get_event_loop().run_in_executor(
-        None, lambda: mcp.run(transport="sse", host=settings.server_host, port=settings.server_port)
-    )
+    # Serve on the running event loop instead of a worker thread
+    await mcp.run_async(transport="sse", host=settings.server_host, port=settings.server_port)
 
 
 def run_mcp_stdio() -> None:
     """Run MCP server with stdio transport."""
+    from mcp_optimizer.mcp_server import create_mcp_server
+
     logging.info("Starting MCP stdio server for local MCP clients")
     mcp = create_mcp_server()
     mcp.run(transport="stdio")
 
 
-async def main() -> None:
+def _install_uvloop() -> None:
+    """Use uvloop for the SSE event loop when it is available."""
+    try:
+        import uvloop  # installed with uvicorn[standard] on supported platforms
+    except ImportError:
+        return
+
+    import asyncio
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+
+def main() -> None:
     """Main entry point for the MCP server."""
     setup_logging()
 
     try:
         if settings.transport_mode == TransportMode.SSE:
             # MCP over HTTP SSE - proper MCP protocol via HTTP Server-Sent Events
-            await run_mcp_sse()
+            import asyncio
+
+            _install_uvloop()
+            asyncio.run(run_mcp_sse())
         else:
             # Default: MCP over stdio - for local MCP clients (Claude Desktop, VS Code, etc.)
+            # Dispatched directly, without wrapping it in an event loop of our own
             run_mcp_stdio()
 
     except KeyboardInterrupt:
@@ -66,13 +89,20 @@ async def main() -> None:
         sys.exit(1)
 
 
-# Export mcp object for FastMCP CLI compatibility
-mcp = create_mcp_server()
+# Exported for FastMCP CLI compatibility, built lazily by __getattr__ below
+mcp: "FastMCP[dict[str, str]]"
+
+
+def __getattr__(name: str) -> Any:
+    """Build the ``mcp`` object for FastMCP CLI compatibility on first access."""
+    global mcp
+    if name == "mcp":
+        from mcp_optimizer.mcp_server import create_mcp_server
+
+        mcp = create_mcp_server()
+        return mcp
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 if __name__ == "__main__":
-    # Run async main if needed for SSE, otherwise sync for stdio
-    if settings.transport_mode == TransportMode.SSE:
-        asyncio.run(main())
-    else:
-        # For stdio mode, run sync
-        run_mcp_stdio()
+    main()
@@ -1,12 +1,14 @@
 #!/usr/bin/env python3
 """Debug script to check tools structure."""
 
+import argparse
 import asyncio
+import inspect
 
 from mcp_optimizer.mcp_server import create_mcp_server
 
 
-async def debug_tools():
+async def debug_tools(details: bool = False, source: bool = False) -> None:
     """Debug tools structure."""
     server = create_mcp_server()
     tools = await server.get_tools()
@@ -14,12 +16,22 @@ async def debug_tools():
     print(f"Tools type: {type(tools)}")
     print(f"Tools length: {len(tools)}")
 
-    for i, tool in enumerate(tools):
-        print(f"Tool {i}: {type(tool)} = {tool}")
-        if hasattr(tool, "__dict__"):
+    for i, (name, tool) in enumerate(tools.items()):
+        print(f"Tool {i}: {name}")
+        if details:
+            print(f"  Type: {type(tool)}")
             print(f"  Attributes: {tool.__dict__}")
-        print()
+        if source:
+            # Only read source files on request: getsource goes through linecache
+            print(inspect.getsource(tool.fn))
+        if details or source:
+            print()
 
 
 if __name__ == "__main__":
-    asyncio.run(debug_tools())
+    parser = argparse.ArgumentParser(description="Inspect registered MCP Optimizer tools")
+    parser.add_argument("--details", action="store_true", help="Print tool attributes")
+    parser.add_argument("--source", action="store_true", help="Print tool function source")
+    args = parser.parse_args()
+
+    asyncio.run(debug_tools(details=args.details, source=args.source))
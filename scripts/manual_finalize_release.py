@@ -14,42 +14,91 @@ This script serves as a fallback option for emergency situations.
 Finalize release script for MCP Optimizer - creates tags and merges back to develop."""
 
 import argparse
+import json
+import os
 import re
+import shutil
 import subprocess
 import sys
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections.abc import Callable
+from functools import lru_cache
 from pathlib import Path
+from typing import Any, cast
 
+GITHUB_REPO = "dmitryanchikov/mcp-optimizer"
 
-def run_command(cmd: list[str], check: bool = True) -> subprocess.CompletedProcess:
-    """Run a shell command and return the result."""
+_GIT = ["git", "--no-pager", "-c", "color.ui=false", "-c", "protocol.version=2"]
+_SEMVER_RE = re.compile(r"^\d+\.\d+\.\d+$")
+# A quoted TOML string value for the version key, ignoring any trailing comment
+_VERSION_LINE_RE = re.compile(r"""version\s*=\s*(["'])(.*?)\1""")
+# Run conclusions that block a release; skipped and neutral runs do not
+_FAILED_CONCLUSIONS = frozenset(
+    ("failure", "cancelled", "timed_out", "action_required", "startup_failure", "stale")
+)
+
+
+def run_command(
+    cmd: list[str], check: bool = True, capture: bool = True, input: str | None = None
+) -> subprocess.CompletedProcess:
+    """Run a shell command and return the result.
+
+    With ``capture=False`` stdout is discarded and only stderr is kept for
+    error reporting, for commands whose output is never inspected. ``input``
+    is passed to the command on stdin.
+    """
     print(f"Running: {' '.join(cmd)}")
-    return subprocess.run(cmd, check=check, capture_output=True, text=True)
+    if capture:
+        return subprocess.run(cmd, check=check, capture_output=True, text=True, input=input)
+    return subprocess.run(
+        cmd,
+        check=check,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        input=input,
+    )
+
+
+def run_git(*args: str, check: bool = True, capture: bool = True) -> subprocess.CompletedProcess:
+    """Run a git command without pager or color post-processing."""
+    return run_command([*_GIT, *args], check=check, capture=capture)
 
 
 def get_current_branch() -> str:
     """Get current git branch."""
-    result = run_command(["git", "branch", "--show-current"])
+    result = run_git("branch", "--show-current")
     return result.stdout.strip()
 
 
 def get_current_version() -> str:
     """Get current version from pyproject.toml."""
     pyproject_path = Path("pyproject.toml")
-    content = pyproject_path.read_text()
-    # Extract version from [project] section only
-    project_section = re.search(r"\[project\](.*?)(?=\n\[|\Z)", content, re.DOTALL)
-    if not project_section:
+    found_project = False
+    in_project = False
+    # Scan line by line and stop at the first version in the [project] section
+    with pyproject_path.open(encoding="utf-8") as f:
+        for line in f:
+            stripped = line.strip()
+            if stripped.startswith("["):
+                in_project = stripped == "[project]"
+                found_project = found_project or in_project
+            elif in_project:
+                match = _VERSION_LINE_RE.match(stripped)
+                if match:
+                    return match.group(2)
+
+    if not found_project:
         raise ValueError("Could not find [project] section in pyproject.toml")
-
-    match = re.search(r'version = "([^"]+)"', project_section.group(1))
-    if not match:
-        raise ValueError("Could not find version in pyproject.toml")
-    return match.group(1)
+    raise ValueError("Could not find version in pyproject.toml")
 
 
 def check_git_status() -> bool:
     """Check if git working directory is clean."""
-    result = run_command(["git", "status", "--porcelain"], check=False)
+    result = run_git("status", "--porcelain", check=False)
     if result.stdout.strip():
         print("❌ Git working directory is not clean!")
         print("Please commit or stash your changes before finalizing release.")
@@ -67,21 +116,23 @@ def ensure_on_main() -> bool:
     return True
 
 
+def update_main_branch() -> None:
+    """Pull the latest main so CI is checked on the commit that gets tagged."""
+    print("Updating main branch...")
+    run_git("pull", "origin", "main", capture=False)
+
+
 def create_release_tag(version: str) -> None:
     """Create and push release tag."""
     tag_name = f"v{version}"
 
-    # Ensure main is up to date
-    print("Updating main branch...")
-    run_command(["git", "pull", "origin", "main"])
-
     # Create annotated tag
     print(f"Creating release tag: {tag_name}")
-    run_command(["git", "tag", "-a", tag_name, "-m", f"Release {version}"])
+    run_git("tag", "-a", tag_name, "-m", f"Release {version}", capture=False)
 
     # Push tag
     print(f"Pushing tag: {tag_name}")
-    run_command(["git", "push", "origin", tag_name])
+    run_git("push", "origin", tag_name, capture=False)
 
     print(f"✅ Release tag {tag_name} created and pushed")
 
@@ -93,25 +144,22 @@ def merge_back_to_develop(version: str) -> None:
     try:
         # Create merge branch from DEVELOP
         merge_branch = f"merge/release-v{version}-to-develop"
-        run_command(["git", "checkout", "develop"])
-        run_command(["git", "pull", "origin", "develop"])
-        run_command(["git", "checkout", "-b", merge_branch])
+        run_git("checkout", "develop", capture=False)
+        run_git("pull", "origin", "develop", capture=False)
+        run_git("checkout", "-b", merge_branch, capture=False)
 
         # Attempt merge with main
-        run_command(["git", "fetch", "origin", "main"])
-        run_command(
-            [
-                "git",
-                "merge",
-                "origin/main",
-                "--no-ff",
-                "-m",
-                f"chore: merge release v{version} back to develop",
-            ]
+        run_git("fetch", "origin", "main", capture=False)
+        run_git(
+            "merge",
+            "origin/main",
+            "--no-ff",
+            "-m",
+            f"chore: merge release v{version} back to develop",
         )
 
         # Push merge branch
-        run_command(["git", "push", "origin", merge_branch])
+        run_git("push", "origin", merge_branch, capture=False)
 
         # Create PR
         pr_body = f"""
@@ -131,6 +179,7 @@ This PR merges changes from release v{version} back to the develop branch to ens
 **Auto-generated by release finalization process**
         """
 
+        # Pass the body on stdin rather than as a (long) argv entry
         run_command(
             [
                 "gh",
@@ -142,11 +191,12 @@ This PR merges changes from release v{version} back to the develop branch to ens
                 merge_branch,
                 "--title",
                 f"Merge release v{version} back to develop",
-                "--body",
-                pr_body,
+                "--body-file",
+                "-",
                 "--label",
                 "release,merge-back",
-            ]
+            ],
+            input=pr_body,
         )
 
         print("✅ PR created to merge main back to develop")
@@ -205,12 +255,13 @@ See: https://github.com/dmitryanchikov/mcp-optimizer/blob/main/.github/RELEASE_P
                     "create",
                     "--title",
                     f"Merge conflict: release v{version} main→develop (PR required)",
-                    "--body",
-                    issue_body,
+                    "--body-file",
+                    "-",
                     "--label",
                     "merge-conflict,release,pr-required",
                 ],
                 check=False,
+                input=issue_body,
             )
 
             raise Exception(
@@ -227,21 +278,113 @@ def cleanup_release_branch(version: str) -> None:
     print(f"Cleaning up release branch: {branch_name}")
 
     # Delete local branch
-    run_command(["git", "branch", "-d", branch_name], check=False)
+    run_git("branch", "-d", branch_name, check=False, capture=False)
 
     # Delete remote branch
-    run_command(["git", "push", "origin", "--delete", branch_name], check=False)
+    run_git("push", "origin", "--delete", branch_name, check=False, capture=False)
 
     print(f"✅ Release branch {branch_name} cleaned up")
 
 
-def wait_for_ci_success() -> bool:
-    """Check if CI/CD pipeline is successful (simplified check)."""
-    print("⚠️ Please ensure CI/CD pipeline has completed successfully before proceeding")
-    print("Check: https://github.com/dmitryanchikov/mcp-optimizer/actions")
+@lru_cache(maxsize=1)
+def get_github_token() -> str | None:
+    """Return a GitHub token from the environment or the gh CLI, if available.
+
+    Unauthenticated API requests are limited to 60 per hour, which CI polling
+    would use up quickly.
+    """
+    token = os.environ.get("GITHUB_TOKEN") or os.environ.get("GH_TOKEN")
+    if token:
+        return token
+    if shutil.which("gh") is None:
+        return None
+    result = subprocess.run(["gh", "auth", "token"], check=False, capture_output=True, text=True)
+    return result.stdout.strip() or None
+
+
+def get_workflow_runs(**params: str) -> list[dict]:
+    """Fetch GitHub Actions workflow runs matching the given query parameters."""
+    url = (
+        f"https://api.github.com/repos/{GITHUB_REPO}/actions/runs?{urllib.parse.urlencode(params)}"
+    )
+    headers = {"Accept": "application/vnd.github+json"}
+    token = get_github_token()
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+
+    request = urllib.request.Request(url, headers=headers)
+    with urllib.request.urlopen(request, timeout=10) as response:  # nosec B310 - fixed https URL
+        payload: dict[str, Any] = json.load(response)
+    return cast(list[dict], payload.get("workflow_runs", []))
+
+
+def poll_workflow_runs(
+    until: Callable[[list[dict]], bool], timeout: float, **params: str
+) -> list[dict] | None:
+    """Poll workflow runs with exponential backoff until ``until`` holds.
+
+    Returns the matching runs, or None if the timeout expires first.
+    """
+    deadline = time.monotonic() + timeout
+    delay = 0.5
+    while True:
+        runs = get_workflow_runs(**params)
+        if until(runs):
+            return runs
+        if time.monotonic() + delay > deadline:
+            return None
+        time.sleep(delay)
+        delay = min(delay * 2, 8.0)
+
+
+def all_runs_completed(runs: list[dict]) -> bool:
+    """Check that there is at least one run and all runs have completed."""
+    return bool(runs) and all(run["status"] == "completed" for run in runs)
+
+
+def wait_for_ci_success(timeout: float = 600.0) -> bool:
+    """Wait for CI/CD runs on the main branch head to finish successfully."""
+    print(f"Check: https://github.com/{GITHUB_REPO}/actions")
+    head_sha = run_git("rev-parse", "main").stdout.strip()
+    print(f"Waiting for CI/CD on main ({head_sha[:7]})...")
+
+    try:
+        runs = poll_workflow_runs(all_runs_completed, timeout, head_sha=head_sha)
+    except (urllib.error.URLError, OSError, ValueError) as e:
+        # API unavailable (offline, rate limited): fall back to asking the user
+        print(f"⚠️ Could not query GitHub Actions: {e}")
+        print("⚠️ Please ensure CI/CD pipeline has completed successfully before proceeding")
+        response = input("Has CI/CD completed successfully? (y/N): ").lower().strip()
+        return response in ["y", "yes"]
+
+    if runs is None:
+        print(f"❌ CI/CD did not complete within {timeout:.0f}s")
+        return False
+
+    failed = [run["name"] for run in runs if run["conclusion"] in _FAILED_CONCLUSIONS]
+    if failed:
+        print(f"❌ CI/CD runs did not succeed: {', '.join(failed)}")
+        return False
+
+    print("✅ CI/CD completed successfully")
+    return True
+
+
+def wait_for_tag_workflows(tag_name: str, timeout: float = 60.0) -> None:
+    """Wait until GitHub Actions has picked up the pushed release tag."""
+    print("\nWaiting for tag to be processed...")
+    try:
+        runs = poll_workflow_runs(bool, timeout, branch=tag_name, event="push")
+    except (urllib.error.URLError, OSError, ValueError) as e:
+        print(f"⚠️ Could not query GitHub Actions: {e}")
+        return
+
+    if runs is None:
+        print(f"⚠️ No workflow runs for {tag_name} yet, check GitHub Actions manually")
+        return
 
-    response = input("Has CI/CD completed successfully? (y/N): ").lower().strip()
-    return response in ["y", "yes"]
+    for run in runs:
+        print(f"- {run['name']}: {run['html_url']}")
 
 
 def main():
@@ -257,7 +400,7 @@ def main():
     # Get version
     if args.version:
         version = args.version
-        if not re.match(r"^\d+\.\d+\.\d+$", version):
+        if not _SEMVER_RE.match(version):
             print("❌ Version must be in format X.Y.Z (e.g., 0.2.0)")
             sys.exit(1)
     else:
@@ -268,26 +411,21 @@ def main():
     if args.dry_run:
         print("🔍 DRY RUN - No changes will be made")
         print("Steps that would be executed:")
-        print("1. Check CI/CD success")
-        print("2. Ensure on main branch")
-        print("3. Check git status")
-        print(f"4. Create and push tag: v{version}")
-        print("5. Merge main back to develop")
+        print("1. Ensure on main branch")
+        print("2. Check git status")
+        print("3. Update main branch")
+        print("4. Check CI/CD success")
+        print(f"5. Create and push tag: v{version}")
+        print("6. Merge main back to develop")
         if not args.skip_cleanup:
-            print(f"6. Cleanup release branch: release/v{version}")
+            print(f"7. Cleanup release branch: release/v{version}")
         print("\nThis will trigger:")
         print("- PyPI package publication")
         print("- Docker image publication")
         print("- GitHub release creation")
         return
 
-    # Check CI/CD success
-    if not args.skip_ci_check:
-        if not wait_for_ci_success():
-            print("❌ Please wait for CI/CD to complete successfully")
-            sys.exit(1)
-
-    # Ensure on main branch
+    # Ensure on main branch (local checks run first so they fail before the CI wait)
     if not ensure_on_main():
         sys.exit(1)
 
@@ -295,6 +433,14 @@ def main():
     if not check_git_status():
         sys.exit(1)
 
+    update_main_branch()
+
+    # Check CI/CD success on the commit about to be tagged
+    if not args.skip_ci_check:
+        if not wait_for_ci_success():
+            print("❌ Please wait for CI/CD to complete successfully")
+            sys.exit(1)
+
     # Create and push release tag
     create_release_tag(version)
 
@@ -304,10 +450,7 @@ def main():
     print("- Create GitHub release with artifacts")
 
     # Wait a moment for tag to be processed
-    print("\nWaiting for tag to be processed...")
-    import time
-
-    time.sleep(5)
+    wait_for_tag_workflows(f"v{version}")
 
     print(f"\n🎉 Release v{version} finalized successfully!")
     print("\nRelease artifacts will be available at:")
@@ -2,22 +2,57 @@
 """Release preparation script for MCP Optimizer with Git Flow support."""
 
 import argparse
+import asyncio
 import re
 import subprocess
 import sys
+from collections.abc import Callable
 from datetime import datetime
 from pathlib import Path
 
+_GIT = ["git", "--no-pager", "-c", "color.ui=false", "-c", "protocol.version=2"]
+_STREAM_CHUNK_SIZE = 128 * 1024
+_REWRITE_BUFFER_SIZE = 128 * 1024
+_PROJECT_SECTION_RE = re.compile(r"\[project\](.*?)(?=\n\[|\Z)", re.DOTALL)
+_VERSION_RE = re.compile(r'version = "([^"]+)"')
+# Only matches the version in the [project] section, not other version fields
+_PROJECT_VERSION_SUB_RE = re.compile(r'(\[project\].*?version = ")[^"]+(")', re.DOTALL)
+_SEMVER_RE = re.compile(r"^\d+\.\d+\.\d+$")
 
-def run_command(cmd: list[str], check: bool = True) -> subprocess.CompletedProcess:
-    """Run a shell command and return the result."""
+
+def run_command(
+    cmd: list[str], check: bool = True, capture: bool = True
+) -> subprocess.CompletedProcess:
+    """Run a shell command and return the result.
+
+    With ``capture=False`` stdout is discarded and only stderr is kept for
+    error reporting, for commands whose output is never inspected.
+    """
     print(f"Running: {' '.join(cmd)}")
-    return subprocess.run(cmd, check=check, capture_output=True, text=True)
+    if capture:
+        return subprocess.run(cmd, check=check, capture_output=True, text=True)
+    return subprocess.run(
+        cmd, check=check, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+    )
+
+
+def run_git(*args: str, check: bool = True, capture: bool = True) -> subprocess.CompletedProcess:
+    """Run a git command without pager or color post-processing."""
+    return run_command([*_GIT, *args], check=check, capture=capture)
+
+
+def _rewrite(path: Path, transform: Callable[[str], str]) -> None:
+    """Rewrite a text file in place, opening it only once."""
+    with path.open("r+", encoding="utf-8", buffering=_REWRITE_BUFFER_SIZE) as f:
+        updated = transform(f.read())
+        f.seek(0)
+        f.write(updated)
+        f.truncate()
 
 
 def get_current_branch() -> str:
     """Get current git branch."""
-    result = run_command(["git", "branch", "--show-current"])
+    result = run_git("branch", "--show-current")
     return result.stdout.strip()
 
 
@@ -26,11 +61,11 @@ def get_current_version() -> str:
     pyproject_path = Path("pyproject.toml")
     content = pyproject_path.read_text()
     # Extract version from [project] section only
-    project_section = re.search(r"\[project\](.*?)(?=\n\[|\Z)", content, re.DOTALL)
+    project_section = _PROJECT_SECTION_RE.search(content)
     if not project_section:
         raise ValueError("Could not find [project] section in pyproject.toml")
 
-    match = re.search(r'version = "([^"]+)"', project_section.group(1))
+    match = _VERSION_RE.search(project_section.group(1))
     if not match:
         raise ValueError("Could not find version in pyproject.toml")
     return match.group(1)
@@ -38,19 +73,11 @@ def get_current_version() -> str:
 
 def update_version(new_version: str) -> None:
     """Update version in pyproject.toml."""
-    pyproject_path = Path("pyproject.toml")
-    content = pyproject_path.read_text()
-
     # Only update the project version in the [project] section
-    # Use a more specific regex to avoid updating other version fields
-    updated_content = re.sub(
-        r'(\[project\].*?version = ")[^"]+(")',
-        rf"\g<1>{new_version}\g<2>",
-        content,
-        flags=re.DOTALL,
+    _rewrite(
+        Path("pyproject.toml"),
+        lambda content: _PROJECT_VERSION_SUB_RE.sub(rf"\g<1>{new_version}\g<2>", content, count=1),
     )
-
-    pyproject_path.write_text(updated_content)
     print(f"Updated version to {new_version} in pyproject.toml")
 
 
@@ -64,64 +91,89 @@ def update_changelog(version: str) -> None:
         print("⚠️ CHANGELOG.md not found, skipping changelog update")
         return
 
-    content = changelog_path.read_text()
-
     # Replace [Unreleased] with version and date
     today = datetime.now().strftime("%Y-%m-%d")
-    updated_content = content.replace(
-        "## [Unreleased]", f"## [Unreleased]\n\n## [{version}] - {today}"
+    _rewrite(
+        changelog_path,
+        lambda content: content.replace(
+            "## [Unreleased]", f"## [Unreleased]\n\n## [{version}] - {today}"
+        ),
     )
-
-    changelog_path.write_text(updated_content)
     print(f"Updated CHANGELOG.md with version {version}")
 
 
-def run_tests() -> bool:
-    """Run all tests to ensure everything works."""
-    print("Running tests...")
-
-    # Run unit tests
-    result = run_command(["uv", "run", "pytest", "tests/", "-v"], check=False)
-    if result.returncode != 0:
-        print("❌ Unit tests failed!")
-        print(result.stdout)
-        print(result.stderr)
-        return False
+async def _run_check(label: str, cmd: list[str], stream: bool = False) -> tuple[str, int, str, str]:
+    """Run a check command asynchronously and capture its output.
 
-    # Run comprehensive tests
-    result = run_command(
-        ["uv", "run", "python", "tests/test_integration/comprehensive_test.py"],
-        check=False,
+    With ``stream=True`` stdout and stderr are merged and copied to the console
+    as they arrive instead of being buffered, so the returned output is empty.
+    """
+    print(f"Running: {' '.join(cmd)}")
+    if not stream:
+        proc = await asyncio.create_subprocess_exec(
+            *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        )
+        stdout, stderr = await proc.communicate()
+        return (
+            label,
+            proc.returncode if proc.returncode is not None else 1,
+            stdout.decode(errors="replace"),
+            stderr.decode(errors="replace"),
+        )
+
+    proc = await asyncio.create_subprocess_exec(
+        *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT
     )
-    if result.returncode != 0:
-        print("❌ Comprehensive tests failed!")
-        print(result.stdout)
-        print(result.stderr)
-        return False
+    assert proc.stdout is not None
+    sys.stdout.flush()
+    while chunk := await proc.stdout.read(_STREAM_CHUNK_SIZE):
+        sys.stdout.buffer.write(chunk)
+        sys.stdout.buffer.flush()
+    return label, await proc.wait(), "", ""
 
-    # Run linting
-    result = run_command(["uv", "run", "ruff", "check", "src/"], check=False)
-    if result.returncode != 0:
-        print("❌ Linting failed!")
-        print(result.stdout)
-        print(result.stderr)
-        return False
 
-    # Run type checking
-    result = run_command(["uv", "run", "mypy", "src/"], check=False)
-    if result.returncode != 0:
-        print("❌ Type checking failed!")
-        print(result.stdout)
-        print(result.stderr)
-        return False
+async def run_tests() -> bool:
+    """Run all tests to ensure everything works."""
+    print("Running tests...")
 
-    print("✅ All tests passed!")
-    return True
+    # Unit tests, linting and type checking are independent, so run them concurrently.
+    # Only the long pytest output is streamed; the other checks report on failure.
+    results = list(
+        await asyncio.gather(
+            _run_check("Unit tests", ["uv", "run", "pytest", "tests/", "-v"], stream=True),
+            _run_check("Linting", ["uv", "run", "ruff", "check", "src/"]),
+            _run_check("Type checking", ["uv", "run", "mypy", "src/"]),
+        )
+    )
+
+    # Run comprehensive tests only once the fast checks have passed
+    if all(returncode == 0 for _, returncode, _, _ in results):
+        results.append(
+            await _run_check(
+                "Comprehensive tests",
+                ["uv", "run", "python", "tests/test_integration/comprehensive_test.py"],
+                stream=True,
+            )
+        )
+
+    passed = True
+    for label, returncode, stdout, stderr in results:
+        if returncode != 0:
+            print(f"❌ {label} failed!")
+            if stdout:
+                print(stdout)
+            if stderr:
+                print(stderr)
+            passed = False
+
+    if passed:
+        print("✅ All tests passed!")
+    return passed
 
 
 def check_git_status() -> bool:
     """Check if git working directory is clean."""
-    result = run_command(["git", "status", "--porcelain"], check=False)
+    result = run_git("status", "--porcelain", check=False)
     if result.stdout.strip():
         print("❌ Git working directory is not clean!")
         print("Please commit or stash your changes before releasing.")
@@ -145,26 +197,26 @@ def create_release_branch(version: str) -> str:
 
     # Ensure develop is up to date
     print("Updating develop branch...")
-    run_command(["git", "pull", "origin", "develop"])
+    run_git("pull", "origin", "develop", capture=False)
 
     # Create release branch
     print(f"Creating release branch: {branch_name}")
-    run_command(["git", "checkout", "-b", branch_name])
+    run_git("checkout", "-b", branch_name, capture=False)
 
     return branch_name
 
 
 def commit_release_changes(version: str) -> None:
     """Commit release preparation changes."""
-    run_command(["git", "add", "."])
-    run_command(["git", "commit", "-m", f"chore: prepare release v{version}"])
+    run_git("add", ".", capture=False)
+    run_git("commit", "-m", f"chore: prepare release v{version}", capture=False)
     print(f"Committed release preparation for v{version}")
 
 
 def push_release_branch(branch_name: str) -> None:
     """Push release branch to origin."""
     print(f"Pushing release branch: {branch_name}")
-    run_command(["git", "push", "origin", branch_name])
+    run_git("push", "origin", branch_name, capture=False)
     print("✅ Release branch pushed to origin")
     print("CI/CD will now build release candidate")
 
@@ -175,12 +227,12 @@ def create_hotfix_branch(version: str) -> str:
 
     # Switch to main and update
     print("Switching to main branch...")
-    run_command(["git", "checkout", "main"])
-    run_command(["git", "pull", "origin", "main"])
+    run_git("checkout", "main", capture=False)
+    run_git("pull", "origin", "main", capture=False)
 
     # Create hotfix branch
     print(f"Creating hotfix branch: {branch_name}")
-    run_command(["git", "checkout", "-b", branch_name])
+    run_git("checkout", "-b", branch_name, capture=False)
 
     return branch_name
 
@@ -238,7 +290,7 @@ def main():
     elif args.version:
         new_version = args.version
         # Validate version format
-        if not re.match(r"^\d+\.\d+\.\d+$", new_version):
+        if not _SEMVER_RE.match(new_version):
             print("❌ Version must be in format X.Y.Z (e.g., 0.2.0)")
             sys.exit(1)
     else:
@@ -291,7 +343,7 @@ def main():
     update_changelog(new_version)
 
     # Run tests
-    if not run_tests():
+    if not asyncio.run(run_tests()):
         print("❌ Tests failed, aborting release")
         sys.exit(1)
 
@@ -72,6 +72,10 @@ class Settings(BaseSettings):
         description="Maximum memory usage in MB",
         ge=128,
     )
+    knapsack_cache: bool = Field(
+        default=True,
+        description="Cache results of repeated knapsack problems",
+    )
 
     # Logging configuration
     log_level: LogLevel = Field(
@@ -3,35 +3,43 @@
 import argparse
 import logging
 import sys
+from typing import TYPE_CHECKING, Any
 
 import uvicorn
 
 from mcp_optimizer.config import TransportMode, settings
-from mcp_optimizer.mcp_server import create_mcp_server
+from mcp_optimizer.utils.log_format import CachedTimeFormatter, JsonFormatter
+from mcp_optimizer.utils.log_handler import BufferedStderrHandler
+
+if TYPE_CHECKING:
+    from fastmcp import FastMCP
 
 
 def setup_logging() -> None:
     """Setup logging configuration."""
     log_level = getattr(logging, settings.log_level.value)
+    # Batch stderr writes instead of issuing one syscall per record
+    handler = BufferedStderrHandler()
 
     if settings.log_format.value == "json":
         # For production, use structured JSON logging
-        logging.basicConfig(
-            level=log_level,
-            format='{"timestamp": "%(asctime)s", "level": "%(levelname)s", "module": "%(name)s", "message": "%(message)s"}',
-            datefmt="%Y-%m-%dT%H:%M:%S",
-        )
+        handler.setFormatter(JsonFormatter(datefmt="%Y-%m-%dT%H:%M:%S"))
+        logging.basicConfig(level=log_level, handlers=[handler])
     else:
         # For development, use human-readable format
-        logging.basicConfig(
-            level=log_level,
-            format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-            datefmt="%Y-%m-%d %H:%M:%S",
+        handler.setFormatter(
+            CachedTimeFormatter(
+                "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+                datefmt="%Y-%m-%d %H:%M:%S",
+            )
         )
+        logging.basicConfig(level=log_level, handlers=[handler])
 
 
 def run_stdio_server() -> None:
     """Run MCP server with stdio transport."""
+    from mcp_optimizer.mcp_server import create_mcp_server
+
     logging.info("Starting MCP Optimizer server with stdio transport")
 
     mcp_server = create_mcp_server()
@@ -42,6 +50,8 @@ def run_stdio_server() -> None:
 
 async def run_sse_server() -> None:
     """Run MCP server with SSE transport."""
+    from mcp_optimizer.mcp_server import create_mcp_server
+
     logging.info(
         f"Starting MCP Optimizer server with SSE transport on {settings.server_host}:{settings.server_port}"
     )
@@ -65,6 +75,18 @@ async def run_sse_server() -> None:
     await server.serve()
 
 
+def _install_uvloop() -> None:
+    """Use uvloop for the SSE event loop when it is available."""
+    try:
+        import uvloop  # installed with uvicorn[standard] on supported platforms
+    except ImportError:
+        return
+
+    import asyncio
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+
 def parse_args() -> argparse.Namespace:
     """Parse command line arguments."""
     parser = argparse.ArgumentParser(
@@ -142,6 +164,7 @@ def main() -> None:
             # For SSE transport, we need async
             import asyncio
 
+            _install_uvloop()
             asyncio.run(run_sse_server())
     except KeyboardInterrupt:
         logging.info("Server shutdown requested")
@@ -160,8 +183,20 @@ def cli_main() -> None:
         pass
 
 
-# Export mcp object for FastMCP CLI compatibility
-mcp = create_mcp_server()
+# Exported for FastMCP CLI compatibility, built lazily by __getattr__ below
+mcp: "FastMCP[dict[str, str]]"
+
+
+def __getattr__(name: str) -> Any:
+    """Build the ``mcp`` object for FastMCP CLI compatibility on first access."""
+    global mcp
+    if name == "mcp":
+        from mcp_optimizer.mcp_server import create_mcp_server
+
+        mcp = create_mcp_server()
+        return mcp
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 if __name__ == "__main__":
     cli_main()
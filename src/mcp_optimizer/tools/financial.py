@@ -5,22 +5,47 @@ This module provides tools for solving financial optimization problems including
 - Risk Management
 """
 
-import math
+import importlib.util
+import json
 import time
-from typing import Any
+from functools import _CacheInfo, lru_cache
+from typing import Any, NamedTuple
 
+import numpy as np
 import pulp
 from fastmcp import FastMCP
-from pydantic import BaseModel, Field, ValidationInfo, field_validator
-
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    PrivateAttr,
+    field_validator,
+    model_validator,
+)
+
+from mcp_optimizer.utils.cache_key import canonical_json
 from mcp_optimizer.utils.resource_monitor import with_resource_limits
 
 from ..schemas.base import OptimizationResult, OptimizationStatus
 
+# SLSQP works on dense matrices and slows down sharply with more assets
+# (~0.1 s at 100, ~1 s at 200); larger minimum-variance problems keep the
+# HiGHS solution of the linear covariance proxy
+_QP_MAX_ASSETS = 100
+
+# scipy.optimize is slow to import, so only check that it is installed here
+# and import it when a portfolio LP is actually solved
+try:
+    SCIPY_AVAILABLE = importlib.util.find_spec("scipy.optimize") is not None
+except ImportError:
+    SCIPY_AVAILABLE = False
+
 
 class Asset(BaseModel):
     """Asset definition with return and risk characteristics."""
 
+    model_config = ConfigDict(frozen=True)
+
     name: str
     expected_return: float
     risk: float = Field(ge=0)
@@ -29,17 +54,20 @@ class Asset(BaseModel):
     min_allocation: float = Field(default=0.0, ge=0, le=1)
     max_allocation: float = Field(default=1.0, ge=0, le=1)
 
-    @field_validator("max_allocation")
-    @classmethod
-    def validate_max_allocation(cls, v: float, info: ValidationInfo) -> float:
-        if info.data and "min_allocation" in info.data and v < info.data["min_allocation"]:
+    @model_validator(mode="after")
+    def validate_allocation_bounds(self) -> "Asset":
+        """Validate that max_allocation is not below min_allocation."""
+        if self.max_allocation < self.min_allocation:
             raise ValueError("max_allocation must be >= min_allocation")
-        return v
+        return self
 
 
 class PortfolioInput(BaseModel):
     """Input schema for Portfolio Optimization."""
 
+    # Validated inputs are cached and shared between calls, so they must not change
+    model_config = ConfigDict(frozen=True)
+
     assets: list[Asset]
     budget: float = Field(gt=0)
     risk_tolerance: float = Field(ge=0)
@@ -53,6 +81,8 @@ class PortfolioInput(BaseModel):
     risk_free_rate: float = Field(default=0.02, ge=0)
     correlation_matrix: list[list[float]] | None = None
 
+    _correlation: np.ndarray | None = PrivateAttr(default=None)
+
     @field_validator("assets")
     @classmethod
     def validate_assets(cls, v: list[Asset]) -> list[Asset]:
@@ -68,197 +98,400 @@ class PortfolioInput(BaseModel):
                 raise ValueError(f"Sector limit for {sector} must be between 0 and 1")
         return v
 
-    @field_validator("correlation_matrix")
-    @classmethod
-    def validate_correlation_matrix(
-        cls, v: list[list[float]] | None, info: ValidationInfo
-    ) -> list[list[float]] | None:
-        if v is not None and info.data and "assets" in info.data:
-            n = len(info.data["assets"])
+    @model_validator(mode="after")
+    def validate_correlation_matrix(self) -> "PortfolioInput":
+        if self.correlation_matrix is not None:
+            n = len(self.assets)
+            v = self.correlation_matrix
             if len(v) != n or any(len(row) != n for row in v):
                 raise ValueError("Correlation matrix dimensions must match number of assets")
             # Check if matrix is symmetric and diagonal elements are 1
-            for i in range(n):
-                if abs(v[i][i] - 1.0) > 1e-6:
-                    raise ValueError("Diagonal elements of correlation matrix must be 1")
-                for j in range(i):
-                    if abs(v[i][j] - v[j][i]) > 1e-6:
-                        raise ValueError("Correlation matrix must be symmetric")
-        return v
+            matrix = np.asarray(v, dtype=np.float64)
+            if not np.allclose(np.diag(matrix), 1.0, rtol=0.0, atol=1e-6):
+                raise ValueError("Diagonal elements of correlation matrix must be 1")
+            if not np.allclose(matrix, matrix.T, rtol=0.0, atol=1e-6):
+                raise ValueError("Correlation matrix must be symmetric")
+            # Keep the converted matrix so solvers do not re-parse the nested lists
+            matrix.setflags(write=False)
+            self._correlation = matrix
+        return self
+
+    @property
+    def correlation(self) -> np.ndarray | None:
+        """Validated correlation matrix as a float64 array."""
+        return self._correlation
+
+
+@lru_cache(maxsize=128)
+def _validate_portfolio_json(payload: str) -> PortfolioInput:
+    """Validate a JSON-encoded portfolio input, caching the model."""
+    return PortfolioInput.model_validate_json(payload)
+
+
+def validate_portfolio_input(input_data: dict[str, Any]) -> PortfolioInput:
+    """Validate portfolio input, reusing the model for identical inputs.
+
+    Clients often re-solve the same asset universe with other objectives, so
+    validation (including the O(n^2) correlation matrix checks) is cached
+    under a canonical JSON encoding of the input.
+    """
+    payload = canonical_json(input_data)
+    if payload is None:
+        return PortfolioInput(**input_data)
+    return _validate_portfolio_json(payload)
+
+
+def portfolio_input_cache_info() -> _CacheInfo:
+    """Return hit/miss statistics of the portfolio input validation cache."""
+    return _validate_portfolio_json.cache_info()
+
+
+class _PortfolioSolution(NamedTuple):
+    """Outcome of solving the portfolio LP or QP."""
+
+    status: OptimizationStatus
+    weights: list[float] | None = None
+    objective_value: float | None = None
+    message: str = ""
+
+
+def _solve_lp_highs(
+    objective: np.ndarray,
+    maximize: bool,
+    lower: np.ndarray,
+    upper: np.ndarray,
+    rows: list[tuple[str, np.ndarray, float]],
+) -> _PortfolioSolution:
+    """Solve the portfolio LP in-process with SciPy's HiGHS interface."""
+    from scipy.optimize import linprog
+
+    result = linprog(
+        -objective if maximize else objective,
+        A_ub=np.vstack([row for _, row, _ in rows]) if rows else None,
+        b_ub=np.array([limit for _, _, limit in rows]) if rows else None,
+        A_eq=np.ones((1, len(objective))),
+        b_eq=np.array([1.0]),
+        bounds=np.column_stack((lower, upper)),
+        method="highs",
+    )
 
+    if result.status == 0:
+        return _PortfolioSolution(
+            OptimizationStatus.OPTIMAL,
+            result.x.tolist(),
+            float(-result.fun if maximize else result.fun),
+        )
+    if result.status == 2:
+        return _PortfolioSolution(OptimizationStatus.INFEASIBLE)
+    if result.status == 3:
+        return _PortfolioSolution(OptimizationStatus.UNBOUNDED)
+    return _PortfolioSolution(OptimizationStatus.ERROR, message=result.message)
+
+
+def _minimize_variance(
+    covariance: np.ndarray,
+    lower: np.ndarray,
+    upper: np.ndarray,
+    rows: list[tuple[str, np.ndarray, float]],
+    start: list[float],
+    tol: float = 1e-6,
+) -> _PortfolioSolution | None:
+    """Minimize portfolio variance with SciPy's SLSQP from a feasible starting point.
+
+    Returns None if the solver does not converge or its solution violates the
+    budget, bound or row constraints by more than ``tol``.
+    """
+    from scipy.optimize import minimize
+
+    constraints: list[dict[str, Any]] = [
+        {"type": "eq", "fun": lambda w: w.sum() - 1.0, "jac": lambda w: np.ones_like(w)}
+    ]
+    if rows:
+        a_ub = np.vstack([row for _, row, _ in rows])
+        b_ub = np.array([limit for _, _, limit in rows])
+        constraints.append(
+            {"type": "ineq", "fun": lambda w: b_ub - a_ub @ w, "jac": lambda w: -a_ub}
+        )
 
-@with_resource_limits(timeout_seconds=90.0, estimated_memory_mb=150.0)
-def solve_portfolio_optimization(input_data: dict[str, Any]) -> OptimizationResult:
-    """Solve Portfolio Optimization Problem using PuLP.
+    # Scale the objective to order one so the convergence tolerance is relative
+    scaled = covariance / (float(np.trace(covariance)) / len(covariance) or 1.0)
+    result = minimize(
+        lambda w: w @ scaled @ w,
+        np.asarray(start),
+        jac=lambda w: 2.0 * scaled @ w,
+        bounds=np.column_stack((lower, upper)),
+        constraints=constraints,
+        method="SLSQP",
+        options={"ftol": 1e-10, "maxiter": 500},
+    )
+    if not result.success:
+        return None
+
+    # SLSQP satisfies constraints only to tolerance: remove tiny bound violations
+    # and restore the budget, then check nothing moved out of bounds in doing so
+    weights = result.x
+    if abs(float(weights.sum()) - 1.0) > tol:
+        return None
+    weights = np.clip(weights, lower, upper)
+    weights /= weights.sum()
+    if (
+        np.any(weights < lower - tol)
+        or np.any(weights > upper + tol)
+        or any(float(row @ weights) > limit + tol for _, row, limit in rows)
+    ):
+        return None
+
+    return _PortfolioSolution(
+        OptimizationStatus.OPTIMAL, weights.tolist(), float(weights @ covariance @ weights)
+    )
 
-    Args:
-        input_data: Portfolio optimization problem specification
 
-    Returns:
-        OptimizationResult with optimal portfolio allocation
+def _solve_forced(
+    objective: np.ndarray,
+    lower: np.ndarray,
+    upper: np.ndarray,
+    rows: list[tuple[str, np.ndarray, float]],
+    tol: float = 1e-9,
+) -> _PortfolioSolution | None:
+    """Solve the portfolio LP analytically when the bounds leave no choice.
+
+    Returns None if the weights are not determined by the bounds alone.
     """
+    lower_sum = float(lower.sum())
+    upper_sum = float(upper.sum())
+    if lower_sum > 1.0 + tol or upper_sum < 1.0 - tol:
+        return _PortfolioSolution(OptimizationStatus.INFEASIBLE)
+
+    if len(objective) == 1:
+        weights = np.ones(1)
+    elif abs(lower_sum - 1.0) <= tol:
+        weights = lower
+    elif abs(upper_sum - 1.0) <= tol:
+        weights = upper
+    else:
+        return None
+
+    if any(float(row @ weights) > limit + tol for _, row, limit in rows):
+        return _PortfolioSolution(OptimizationStatus.INFEASIBLE)
+    return _PortfolioSolution(
+        OptimizationStatus.OPTIMAL, weights.tolist(), float(objective @ weights)
+    )
+
+
+def _solve_lp_pulp(
+    objective: np.ndarray,
+    maximize: bool,
+    lower: np.ndarray,
+    upper: np.ndarray,
+    rows: list[tuple[str, np.ndarray, float]],
+    names: list[str],
+) -> _PortfolioSolution:
+    """Solve the portfolio LP with PuLP and the CBC command line solver."""
+    prob = pulp.LpProblem(
+        "Portfolio_Optimization", pulp.LpMaximize if maximize else pulp.LpMinimize
+    )
+
+    # Decision variables: portfolio weight of each asset
+    allocations = [
+        pulp.LpVariable(f"allocation_{name}", lowBound=low, upBound=up, cat="Continuous")
+        for name, low, up in zip(names, lower.tolist(), upper.tolist(), strict=True)
+    ]
+
+    # Build each expression from (variable, coefficient) pairs in one constructor
+    # call instead of summing one temporary expression per asset
+    prob += pulp.LpAffineExpression([(v, 1.0) for v in allocations]) == 1, "Budget_Constraint"
+    for row_name, row, limit in rows:
+        terms = [
+            (allocations[i], coefficient)
+            for i, coefficient in enumerate(row.tolist())
+            if coefficient
+        ]
+        prob += pulp.LpAffineExpression(terms) <= limit, row_name
+    prob += pulp.LpAffineExpression(list(zip(allocations, objective.tolist(), strict=True)))
+
+    prob.solve(pulp.PULP_CBC_CMD(msg=0))
+
+    if prob.status == pulp.LpStatusOptimal:
+        return _PortfolioSolution(
+            OptimizationStatus.OPTIMAL,
+            [variable.varValue for variable in allocations],
+            pulp.value(prob.objective),
+        )
+    if prob.status == pulp.LpStatusInfeasible:
+        return _PortfolioSolution(OptimizationStatus.INFEASIBLE)
+    if prob.status == pulp.LpStatusUnbounded:
+        return _PortfolioSolution(OptimizationStatus.UNBOUNDED)
+    return _PortfolioSolution(OptimizationStatus.ERROR, message=pulp.LpStatus[prob.status])
+
+
+def _solve_portfolio_optimization(
+    input_data: dict[str, Any], use_scipy: bool
+) -> OptimizationResult:
+    """Solve the portfolio LP with SciPy HiGHS if ``use_scipy``, else PuLP CBC."""
     start_time = time.time()
 
     try:
         # Parse and validate input
-        portfolio_input = PortfolioInput(**input_data)
+        portfolio_input = validate_portfolio_input(input_data)
         assets = portfolio_input.assets
         budget = portfolio_input.budget
+        n = len(assets)
 
-        # Create optimization problem
-        if portfolio_input.objective == "maximize_return":
-            prob = pulp.LpProblem("Portfolio_Optimization", pulp.LpMaximize)
-        else:
-            prob = pulp.LpProblem("Portfolio_Optimization", pulp.LpMinimize)
-
-        # Decision variables: allocation amounts for each asset
-        allocations = {}
-        for asset in assets:
-            allocations[asset.name] = pulp.LpVariable(
-                f"allocation_{asset.name}",
-                lowBound=asset.min_allocation * budget,
-                upBound=asset.max_allocation * budget,
-                cat="Continuous",
-            )
-
-        # Budget constraint
-        prob += pulp.lpSum(allocations.values()) == budget, "Budget_Constraint"
-
-        # Global allocation constraints
-        for asset in assets:
-            prob += (
-                allocations[asset.name] >= portfolio_input.min_allocation * budget,
-                f"Min_Allocation_{asset.name}",
-            )
-            prob += (
-                allocations[asset.name] <= portfolio_input.max_allocation * budget,
-                f"Max_Allocation_{asset.name}",
-            )
+        returns = np.fromiter((asset.expected_return for asset in assets), np.float64, n)
+        risks = np.fromiter((asset.risk for asset in assets), np.float64, n)
 
-        # Sector constraints
-        sectors: dict[str, list[Any]] = {}
-        for asset in assets:
-            if asset.sector:
-                if asset.sector not in sectors:
-                    sectors[asset.sector] = []
-                sectors[asset.sector].append(allocations[asset.name])
-
-        for sector, limit in portfolio_input.sector_limits.items():
-            if sector in sectors:
-                prob += (
-                    pulp.lpSum(sectors[sector]) <= limit * budget,
-                    f"Sector_Limit_{sector}",
-                )
+        # The LP is formulated over portfolio weights rather than amounts: scaling
+        # coefficients by 1 / budget pushes them below the solver tolerances for
+        # large budgets, which made CBC stop at suboptimal allocations
+        maximize = portfolio_input.objective != "minimize_risk"
+        covariance = None
+        correlation = portfolio_input.correlation
+        if correlation is not None:
+            covariance = np.outer(risks, risks) * correlation
 
-        # Objective function
         if portfolio_input.objective == "maximize_return":
-            # Maximize expected return
-            expected_return = pulp.lpSum(
-                allocations[asset.name] * asset.expected_return / budget for asset in assets
-            )
-            prob += expected_return, "Expected_Return"
-
+            objective = returns
         elif portfolio_input.objective == "minimize_risk":
-            # Minimize portfolio risk (simplified as weighted average of individual risks)
-            # Note: This is a simplification. True portfolio risk requires covariance matrix
-            if portfolio_input.correlation_matrix:
-                # Use correlation matrix to calculate portfolio variance
-                portfolio_variance = 0
-                for i, asset_i in enumerate(assets):
-                    for j, asset_j in enumerate(assets):
-                        weight_i = allocations[asset_i.name] / budget
-                        weight_j = allocations[asset_j.name] / budget
-                        correlation = portfolio_input.correlation_matrix[i][j]
-                        portfolio_variance += (
-                            weight_i * weight_j * asset_i.risk * asset_j.risk * correlation
-                        )
-
-                # Since PuLP doesn't handle quadratic objectives directly, we'll use a linear approximation
-                # This is a limitation - for true portfolio optimization, a QP solver would be better
-                portfolio_risk = pulp.lpSum(
-                    allocations[asset.name] * asset.risk / budget for asset in assets
-                )
+            if covariance is not None:
+                # Linear proxy of portfolio variance for the LP: each asset weighted
+                # by its row sum of the covariance matrix. With SciPy the LP solution
+                # is then refined into the true minimum-variance portfolio
+                objective = covariance.sum(axis=1)
             else:
-                portfolio_risk = pulp.lpSum(
-                    allocations[asset.name] * asset.risk / budget for asset in assets
-                )
-            prob += portfolio_risk, "Portfolio_Risk"
-
-        elif portfolio_input.objective == "sharpe_ratio":
-            # Maximize Sharpe ratio (simplified)
-            # This is complex to implement directly in linear programming
-            # We'll approximate by maximizing return - risk_penalty * risk
+                # Simplified as weighted average of individual risks
+                objective = risks
+        else:
+            # Sharpe ratio is not linear; approximate by maximizing
+            # return - risk_penalty * risk
             risk_penalty = (
                 1.0 / portfolio_input.risk_tolerance if portfolio_input.risk_tolerance > 0 else 1.0
             )
+            objective = returns - risk_penalty * risks
 
-            expected_return = pulp.lpSum(
-                allocations[asset.name] * asset.expected_return / budget for asset in assets
-            )
-            portfolio_risk = pulp.lpSum(
-                allocations[asset.name] * asset.risk / budget for asset in assets
+        # Per-asset bounds combined with the global allocation limits
+        lower = np.maximum(
+            np.fromiter((asset.min_allocation for asset in assets), np.float64, n),
+            portfolio_input.min_allocation,
+        )
+        upper = np.minimum(
+            np.fromiter((asset.max_allocation for asset in assets), np.float64, n),
+            portfolio_input.max_allocation,
+        )
+        conflicting = np.flatnonzero(lower > upper)
+        if conflicting.size:
+            conflicting_names = ", ".join(assets[i].name for i in conflicting)
+            return OptimizationResult(
+                status=OptimizationStatus.INFEASIBLE,
+                error_message=(
+                    "Portfolio optimization problem is infeasible: minimum allocation "
+                    f"exceeds maximum allocation for {conflicting_names}"
+                ),
+                execution_time=time.time() - start_time,
             )
 
-            sharpe_approximation = expected_return - risk_penalty * portfolio_risk
-            prob += sharpe_approximation, "Sharpe_Approximation"
+        # Number sectors once in order of appearance (-1 for no sector), so sector
+        # membership and totals are integer comparisons instead of string scans
+        sector_ids: dict[str, int] = {}
+        asset_sector_ids = np.fromiter(
+            (
+                sector_ids.setdefault(asset.sector, len(sector_ids)) if asset.sector else -1
+                for asset in assets
+            ),
+            np.intp,
+            n,
+        )
+        in_sector = asset_sector_ids >= 0
 
-        # Risk tolerance constraint
+        # Inequality constraints: sector limits and risk tolerance
+        rows: list[tuple[str, np.ndarray, float]] = []
+        for sector, limit in portfolio_input.sector_limits.items():
+            if sector in sector_ids:
+                members = (asset_sector_ids == sector_ids[sector]).astype(np.float64)
+                rows.append((f"Sector_Limit_{sector}", members, limit))
         if portfolio_input.risk_tolerance > 0:
-            portfolio_risk = pulp.lpSum(
-                allocations[asset.name] * asset.risk / budget for asset in assets
+            rows.append(("Risk_Tolerance", risks, portfolio_input.risk_tolerance))
+
+        # Solve, skipping the solver when the bounds force the allocation
+        minimum_variance = portfolio_input.objective == "minimize_risk" and covariance is not None
+        forced = _solve_forced(objective, lower, upper, rows)
+        if forced is not None:
+            solution = forced
+            solver_name = "Analytic"
+        elif use_scipy:
+            solution = _solve_lp_highs(objective, maximize, lower, upper, rows)
+            solver_name = "SciPy HiGHS"
+            if (
+                minimum_variance
+                and covariance is not None
+                and solution.weights is not None
+                and n <= _QP_MAX_ASSETS
+            ):
+                refined = _minimize_variance(covariance, lower, upper, rows, solution.weights)
+                if refined is not None:
+                    solution = refined
+                    solver_name = "SciPy SLSQP"
+        else:
+            names = [asset.name for asset in assets]
+            solution = _solve_lp_pulp(objective, maximize, lower, upper, rows, names)
+            solver_name = "PuLP CBC"
+
+        # With correlations the objective value is always the portfolio variance;
+        # solutions of the linear proxy are flagged as approximations
+        approximation: dict[str, str] = {}
+        if minimum_variance and covariance is not None and solution.weights is not None:
+            final_weights = np.asarray(solution.weights)
+            solution = solution._replace(
+                objective_value=float(final_weights @ covariance @ final_weights)
             )
-            prob += portfolio_risk <= portfolio_input.risk_tolerance, "Risk_Tolerance"
-
-        # Solve
-        prob.solve(pulp.PULP_CBC_CMD(msg=0))
+            if solver_name not in ("Analytic", "SciPy SLSQP"):
+                approximation = {"approximation": "linear covariance proxy"}
 
         # Process results
-        status = pulp.LpStatus[prob.status]
         execution_time = time.time() - start_time
 
-        if prob.status == pulp.LpStatusOptimal:
+        if solution.status == OptimizationStatus.OPTIMAL and solution.weights is not None:
             # Extract solution
-            portfolio_allocation = {}
-            total_allocation = 0
-            portfolio_return = 0
-            portfolio_risk = 0
-
-            for asset in assets:
-                allocation_amount = allocations[asset.name].varValue
-                allocation_weight = allocation_amount / budget
-
-                portfolio_allocation[asset.name] = {
-                    "amount": allocation_amount,
-                    "weight": allocation_weight,
+            weights = np.asarray(solution.weights, dtype=np.float64)
+            amounts = weights * budget
+            total_allocation = float(amounts.sum())
+            portfolio_return = float(weights @ returns)
+            portfolio_risk = float(weights @ risks)
+
+            portfolio_allocation = {
+                asset.name: {
+                    "amount": amount,
+                    "weight": weight,
                     "expected_return": asset.expected_return,
                     "risk": asset.risk,
                     "sector": asset.sector,
                 }
-
-                total_allocation += allocation_amount
-                portfolio_return += allocation_weight * asset.expected_return
-                portfolio_risk += allocation_weight * asset.risk
+                for asset, amount, weight in zip(
+                    assets, amounts.tolist(), weights.tolist(), strict=True
+                )
+            }
 
             # Calculate portfolio metrics
-            portfolio_variance = portfolio_risk**2  # Simplified
-            portfolio_std = math.sqrt(portfolio_variance) if portfolio_variance > 0 else 0
+            if covariance is not None:
+                # Clamp tiny negative values from rounding (or a non-PSD correlation matrix)
+                portfolio_std = float(np.sqrt(max(float(weights @ covariance @ weights), 0.0)))
+            else:
+                # Without correlations, fall back to the weighted average of asset risks
+                portfolio_std = abs(portfolio_risk)
             sharpe_ratio = (
                 (portfolio_return - portfolio_input.risk_free_rate) / portfolio_std
                 if portfolio_std > 0
                 else 0
             )
 
-            # Sector allocation summary
-            sector_allocation = {}
-            for asset in assets:
-                if asset.sector:
-                    if asset.sector not in sector_allocation:
-                        sector_allocation[asset.sector] = 0
-                    sector_allocation[asset.sector] += portfolio_allocation[asset.name]["weight"]
+            # Sector allocation summary: sum weights per sector id
+            sector_weights = np.bincount(
+                asset_sector_ids[in_sector], weights=weights[in_sector], minlength=len(sector_ids)
+            )
+            sector_allocation = dict(zip(sector_ids, sector_weights.tolist(), strict=True))
 
             return OptimizationResult(
                 status=OptimizationStatus.OPTIMAL,
-                objective_value=pulp.value(prob.objective),
+                objective_value=solution.objective_value,
                 variables={
                     "portfolio_allocation": portfolio_allocation,
                     "portfolio_metrics": {
@@ -274,21 +507,22 @@ def solve_portfolio_optimization(input_data: dict[str, Any]) -> OptimizationResu
                 },
                 execution_time=execution_time,
                 solver_info={
-                    "solver_name": "PuLP CBC",
+                    "solver_name": solver_name,
                     "objective": portfolio_input.objective,
                     "num_assets": len(assets),
                     "num_sectors": len(sector_allocation),
+                    **approximation,
                 },
             )
 
-        elif prob.status == pulp.LpStatusInfeasible:
+        elif solution.status == OptimizationStatus.INFEASIBLE:
             return OptimizationResult(
                 status=OptimizationStatus.INFEASIBLE,
                 error_message="Portfolio optimization problem is infeasible. Check constraints.",
                 execution_time=execution_time,
             )
 
-        elif prob.status == pulp.LpStatusUnbounded:
+        elif solution.status == OptimizationStatus.UNBOUNDED:
             return OptimizationResult(
                 status=OptimizationStatus.UNBOUNDED,
                 error_message="Portfolio optimization problem is unbounded.",
@@ -298,7 +532,7 @@ def solve_portfolio_optimization(input_data: dict[str, Any]) -> OptimizationResu
         else:
             return OptimizationResult(
                 status=OptimizationStatus.ERROR,
-                error_message=f"Solver failed with status: {status}",
+                error_message=f"Solver failed with status: {solution.message}",
                 execution_time=execution_time,
             )
 
@@ -310,82 +544,95 @@ def solve_portfolio_optimization(input_data: dict[str, Any]) -> OptimizationResu
         )
 
 
-@with_resource_limits(timeout_seconds=60.0, estimated_memory_mb=100.0)
-def solve_risk_parity_portfolio(input_data: dict[str, Any]) -> OptimizationResult:
-    """Solve Risk Parity Portfolio Optimization.
+def _scale_within_bounds(
+    scores: np.ndarray, lower: np.ndarray, upper: np.ndarray, tol: float = 1e-9
+) -> np.ndarray | None:
+    """Return weights ``clip(t * scores, lower, upper)`` summing to one.
 
-    This is a simplified implementation that aims for equal risk contribution
-    from each asset in the portfolio.
+    Assets at a bound stay there and the others keep their score proportions.
+    The sum is nondecreasing in ``t``, so ``t`` is found by bisection. Returns
+    None if the bounds cannot sum to one.
+    """
+    if lower.sum() > 1.0 + tol or upper.sum() < 1.0 - tol:
+        return None
+    # Within tolerance of one when the upper bounds only just cover the budget
+    target = min(1.0, float(upper.sum()))
+    low, high = 0.0, 1.0
+    while np.clip(high * scores, lower, upper).sum() < target:
+        if high > 1e300:
+            # Only assets with a zero score remain below their upper bound
+            return None
+        high *= 2.0
+    for _ in range(200):
+        middle = 0.5 * (low + high)
+        if np.clip(middle * scores, lower, upper).sum() < target:
+            low = middle
+        else:
+            high = middle
+        if high - low <= high * 1e-15:
+            break
+    weights: np.ndarray = np.clip(high * scores, lower, upper)
+    weights /= weights.sum()
+    return weights
 
-    Args:
-        input_data: Risk parity portfolio specification
 
-    Returns:
-        OptimizationResult with risk parity portfolio allocation
-    """
+def _solve_risk_parity_portfolio(input_data: dict[str, Any]) -> OptimizationResult:
+    """Allocate inversely proportional to asset risk."""
     start_time = time.time()
 
     try:
         # Parse input (reuse PortfolioInput schema)
-        portfolio_input = PortfolioInput(**input_data)
+        portfolio_input = validate_portfolio_input(input_data)
         assets = portfolio_input.assets
         budget = portfolio_input.budget
 
+        n = len(assets)
+        returns = np.fromiter((asset.expected_return for asset in assets), np.float64, n)
+        risks = np.fromiter((asset.risk for asset in assets), np.float64, n)
+
         # For risk parity, we want equal risk contribution
         # Simplified approach: allocate inversely proportional to risk
-        total_inverse_risk = sum(1.0 / asset.risk for asset in assets if asset.risk > 0)
-
-        if total_inverse_risk == 0:
+        has_risk = risks > 0
+        if not has_risk.any():
             return OptimizationResult(
                 status=OptimizationStatus.ERROR,
                 error_message="All assets have zero risk - cannot create risk parity portfolio",
                 execution_time=time.time() - start_time,
             )
 
-        portfolio_allocation = {}
-        portfolio_return = 0.0
-        portfolio_risk = 0.0
-
-        for asset in assets:
-            if asset.risk > 0:
-                weight = (1.0 / asset.risk) / total_inverse_risk
-                allocation_amount = weight * budget
-
-                # Apply allocation constraints
-                allocation_amount = max(allocation_amount, asset.min_allocation * budget)
-                allocation_amount = min(allocation_amount, asset.max_allocation * budget)
-
-                portfolio_allocation[asset.name] = {
-                    "amount": allocation_amount,
-                    "weight": allocation_amount / budget,
-                    "expected_return": asset.expected_return,
-                    "risk": asset.risk,
-                    "risk_contribution": (allocation_amount / budget) * asset.risk,
-                    "sector": asset.sector,
-                }
+        inverse_risk = np.divide(1.0, risks, out=np.zeros(n), where=has_risk)
 
-                portfolio_return += (allocation_amount / budget) * asset.expected_return
-                portfolio_risk += (allocation_amount / budget) * asset.risk
-            else:
-                portfolio_allocation[asset.name] = {
-                    "amount": 0,
-                    "weight": 0,
-                    "expected_return": asset.expected_return,
-                    "risk": asset.risk,
-                    "risk_contribution": 0,
-                    "sector": asset.sector,
-                }
+        # Apply allocation constraints; zero-risk assets are left out entirely
+        lower = np.fromiter((asset.min_allocation for asset in assets), np.float64, n)
+        upper = np.fromiter((asset.max_allocation for asset in assets), np.float64, n)
+        weights = _scale_within_bounds(
+            inverse_risk, np.where(has_risk, lower, 0.0), np.where(has_risk, upper, 0.0)
+        )
+        if weights is None:
+            return OptimizationResult(
+                status=OptimizationStatus.INFEASIBLE,
+                error_message="Asset allocation limits cannot be met with the full budget",
+                execution_time=time.time() - start_time,
+            )
 
-        # Normalize to budget
-        total_allocation = 0.0
-        for alloc in portfolio_allocation.values():
-            total_allocation += float(alloc["amount"])  # type: ignore[arg-type]
-        if total_allocation > 0:
-            scale_factor = budget / total_allocation
-            for asset_name in portfolio_allocation:
-                portfolio_allocation[asset_name]["amount"] *= scale_factor  # type: ignore[operator]
-                portfolio_allocation[asset_name]["weight"] *= scale_factor  # type: ignore[operator]
-                portfolio_allocation[asset_name]["risk_contribution"] *= scale_factor  # type: ignore[operator]
+        # Metrics are computed from the final weights, after normalization
+        risk_contributions = weights * risks
+        portfolio_return = float(weights @ returns)
+        portfolio_risk = float(risk_contributions.sum())
+
+        portfolio_allocation = {
+            asset.name: {
+                "amount": weight * budget,
+                "weight": weight,
+                "expected_return": asset.expected_return,
+                "risk": asset.risk,
+                "risk_contribution": risk_contribution,
+                "sector": asset.sector,
+            }
+            for asset, weight, risk_contribution in zip(
+                assets, weights.tolist(), risk_contributions.tolist(), strict=True
+            )
+        }
 
         execution_time = time.time() - start_time
 
@@ -398,21 +645,7 @@ def solve_risk_parity_portfolio(input_data: dict[str, Any]) -> OptimizationResul
                     "total_allocation": budget,
                     "expected_return": portfolio_return,
                     "portfolio_risk": portfolio_risk,
-                    "risk_parity_score": (
-                        1.0
-                        - (
-                            max(
-                                float(alloc["risk_contribution"])  # type: ignore[arg-type]
-                                for alloc in portfolio_allocation.values()
-                            )
-                            - min(
-                                float(alloc["risk_contribution"])  # type: ignore[arg-type]
-                                for alloc in portfolio_allocation.values()
-                            )
-                        )
-                    )
-                    if portfolio_allocation
-                    else 0.0,
+                    "risk_parity_score": 1.0 - float(np.ptp(risk_contributions)),
                 },
                 "budget_utilization": 1.0,
             },
@@ -432,6 +665,70 @@ def solve_risk_parity_portfolio(input_data: dict[str, Any]) -> OptimizationResul
         )
 
 
+@lru_cache(maxsize=256)
+def _solve_portfolio_json(payload: str, use_scipy: bool) -> OptimizationResult:
+    """Solve a portfolio LP given as canonical JSON, caching the result."""
+    return _solve_portfolio_optimization(json.loads(payload), use_scipy)
+
+
+@lru_cache(maxsize=256)
+def _solve_risk_parity_json(payload: str) -> OptimizationResult:
+    """Solve a risk parity portfolio given as canonical JSON, caching the result."""
+    return _solve_risk_parity_portfolio(json.loads(payload))
+
+
+def _copy_cached_result(result: OptimizationResult, start_time: float) -> OptimizationResult:
+    """Copy a cached result so callers cannot modify it, with this call's timing."""
+    return result.model_copy(deep=True, update={"execution_time": time.time() - start_time})
+
+
+@with_resource_limits(timeout_seconds=90.0, estimated_memory_mb=150.0)
+def solve_portfolio_optimization(input_data: dict[str, Any]) -> OptimizationResult:
+    """Solve Portfolio Optimization Problem as a linear program.
+
+    The LP is solved in-process with SciPy's HiGHS solver when SciPy is
+    installed, and with PuLP's CBC otherwise. Results for repeated inputs are
+    served from a cache unless ``input_data`` sets ``no_cache``.
+
+    Args:
+        input_data: Portfolio optimization problem specification
+
+    Returns:
+        OptimizationResult with optimal portfolio allocation
+    """
+    start_time = time.time()
+    payload = None if input_data.get("no_cache") else canonical_json(input_data)
+    if payload is None:
+        return _solve_portfolio_optimization(input_data, SCIPY_AVAILABLE)
+    return _copy_cached_result(_solve_portfolio_json(payload, SCIPY_AVAILABLE), start_time)
+
+
+@with_resource_limits(timeout_seconds=60.0, estimated_memory_mb=100.0)
+def solve_risk_parity_portfolio(input_data: dict[str, Any]) -> OptimizationResult:
+    """Solve Risk Parity Portfolio Optimization.
+
+    This is a simplified implementation that aims for equal risk contribution
+    from each asset in the portfolio. Results for repeated inputs are served
+    from a cache unless ``input_data`` sets ``no_cache``.
+
+    Args:
+        input_data: Risk parity portfolio specification
+
+    Returns:
+        OptimizationResult with risk parity portfolio allocation
+    """
+    start_time = time.time()
+    payload = None if input_data.get("no_cache") else canonical_json(input_data)
+    if payload is None:
+        return _solve_risk_parity_portfolio(input_data)
+    return _copy_cached_result(_solve_risk_parity_json(payload), start_time)
+
+
+def portfolio_result_cache_info() -> _CacheInfo:
+    """Return hit/miss statistics of the portfolio optimization result cache."""
+    return _solve_portfolio_json.cache_info()
+
+
 # Define function that can be imported directly
 def optimize_portfolio(
     assets: list[dict[str, Any]],
@@ -1,9 +1,14 @@
 """Knapsack problem tools for MCP server."""
 
+import copy
+import json
 import logging
+import math
 import time
+from functools import _CacheInfo, lru_cache
 from typing import Any
 
+import numpy as np
 from fastmcp import FastMCP
 
 try:
@@ -16,21 +21,165 @@ except ImportError as e:
     ORTOOLS_AVAILABLE = False
 
 from mcp_optimizer.config import settings
+from mcp_optimizer.utils.cache_key import canonical_json
 from mcp_optimizer.utils.resource_monitor import with_resource_limits
 
 logger = logging.getLogger(__name__)
 
-
-# Define function that can be imported directly
-@with_resource_limits(timeout_seconds=60.0, estimated_memory_mb=100.0)
-def solve_knapsack_problem(
+# Values, weights and volumes are scaled to integers for the OR-Tools solver
+_SCALE = 1000
+
+# Largest quantity whose scaled value still fits in the solver's int64
+_MAX_UNSCALED = np.iinfo(np.int64).max // _SCALE
+
+_REQUIRED_ITEM_FIELDS = ("name", "value", "weight")
+
+# Largest DP table (items x reduced capacity) solved with dynamic programming.
+# OR-Tools fills a cell in roughly 10-30 ns, so this bounds the solve to 1-3 s
+_DP_MAX_CELLS = 100_000_000
+
+# Largest reduced capacity for dynamic programming; OR-Tools keeps about 12 bytes
+# per unit of capacity, so this bounds its tables to roughly 60 MB
+_DP_MAX_CAPACITY = 5_000_000
+
+# Memory budget of the weight and volume DP. Per (weight, volume) cell it keeps
+# one decision byte per item plus an int64 value and an int64 temporary
+_DP_2D_MAX_BYTES = 32_000_000
+_DP_2D_BYTES_PER_CELL = 2 * np.dtype(np.int64).itemsize
+
+
+def _scale_for_solver(numbers: list[float]) -> np.ndarray:
+    """Scale item quantities to integers for the solver.
+
+    Integers are multiplied exactly; floats are rounded to the nearest unit so
+    that e.g. ``1.005`` becomes 1005 rather than ``int(1004.999...)``.
+    """
+    array = np.asarray(numbers)
+    if array.dtype.kind not in "iu":
+        array = array.astype(np.float64)
+        if not np.isfinite(array).all():
+            raise ValueError("Item values, weights and volumes must be finite")
+    # int64 arithmetic wraps around silently, so reject overflow before scaling
+    if (np.abs(array) > _MAX_UNSCALED).any():
+        raise ValueError("Item values, weights and volumes are too large for the solver")
+    if array.dtype.kind in "iu":
+        return array.astype(np.int64) * _SCALE
+    scaled: np.ndarray = np.rint(array * _SCALE)
+    return scaled.astype(np.int64)
+
+
+def _scale_capacity(capacity: float) -> int:
+    """Scale a capacity to integer units for the solver.
+
+    Unlike item quantities the capacity is rounded down, so the solver never
+    accepts a selection heavier than the real capacity. The small epsilon
+    keeps e.g. ``0.29 * 1000 == 289.999...`` at 290.
+    """
+    if isinstance(capacity, int):
+        return capacity * _SCALE
+    return math.floor(capacity * _SCALE + 1e-9)
+
+
+class _WeightVolumeDP:
+    """Exact 0-1 knapsack over weight and volume by two-dimensional dynamic programming.
+
+    Implements the subset of the OR-Tools ``KnapsackSolver`` interface used by
+    ``_solve_knapsack_problem``. Each item updates the whole ``(weight, volume)``
+    table in one vectorized NumPy step; the per-item decisions are kept for the
+    traceback, so it is only used while the tables fit ``_DP_2D_MAX_BYTES``.
+    """
+
+    def init(
+        self, values: list[int], weight_matrix: list[list[int]], capacities: list[int]
+    ) -> None:
+        """Set up the problem."""
+        self._values = np.asarray(values, dtype=np.int64)
+        self._weights = np.asarray(weight_matrix[0], dtype=np.int64)
+        self._volumes = np.asarray(weight_matrix[1], dtype=np.int64)
+        self._capacity, self._volume_capacity = capacities
+        self._selected = np.zeros(len(values), dtype=bool)
+
+    def set_time_limit(self, seconds: int) -> None:
+        """Accept a time limit; the table size already bounds the running time."""
+
+    def is_solution_optimal(self) -> bool:
+        """Return whether the solution is proven optimal, which DP always is."""
+        return True
+
+    def solve(self) -> int:
+        """Fill the table and reconstruct the best selection."""
+        capacity, volume_capacity = self._capacity, self._volume_capacity
+        # best[w, v]: best value using at most weight w and volume v
+        best = np.zeros((capacity + 1, volume_capacity + 1), dtype=np.int64)
+        taken = np.zeros((len(self._values), capacity + 1, volume_capacity + 1), dtype=bool)
+        for i, (value, weight, volume) in enumerate(
+            zip(self._values.tolist(), self._weights.tolist(), self._volumes.tolist(), strict=True)
+        ):
+            if weight > capacity or volume > volume_capacity:
+                continue
+            # Computed from the table before this item, so each item is used at most once
+            candidate = best[: capacity + 1 - weight, : volume_capacity + 1 - volume] + value
+            region = best[weight:, volume:]
+            np.greater(candidate, region, out=taken[i, weight:, volume:])
+            np.maximum(region, candidate, out=region)
+            # Free the temporary before the next item allocates its own
+            del candidate
+
+        weight, volume = capacity, volume_capacity
+        for i in range(len(self._values) - 1, -1, -1):
+            if taken[i, weight, volume]:
+                self._selected[i] = True
+                weight -= int(self._weights[i])
+                volume -= int(self._volumes[i])
+        return int(best[capacity, volume_capacity])
+
+    def best_solution_contains(self, item_id: int) -> bool:
+        """Return whether the item is part of the best solution."""
+        return bool(self._selected[item_id])
+
+
+def _selected_copies(solver: Any, count: int) -> np.ndarray:
+    """Return a boolean mask of the item copies in the solver's best solution."""
+    return np.fromiter(
+        (solver.best_solution_contains(i) for i in range(count)), dtype=bool, count=count
+    )
+
+
+def _find_item_error(items: list[Any]) -> str | None:
+    """Return the validation error of the first invalid item, or None if all are valid."""
+    # Cheap combined check per item; only locate and describe the error on failure
+    for item in items:
+        if not (
+            isinstance(item, dict)
+            and "name" in item
+            and "value" in item
+            and "weight" in item
+            and item["value"] >= 0
+            and item["weight"] >= 0
+        ):
+            break
+    else:
+        return None
+
+    for i, item in enumerate(items):
+        if not isinstance(item, dict):
+            return f"Item {i} must be a dictionary"
+        for field in _REQUIRED_ITEM_FIELDS:
+            if field not in item:
+                return f"Item {i} missing required field: {field}"
+        if item["value"] < 0 or item["weight"] < 0:
+            return f"Item {i} value and weight must be non-negative"
+    return None
+
+
+def _solve_knapsack_problem(
     items: list[dict[str, Any]],
     capacity: float,
     volume_capacity: float | None = None,
     knapsack_type: str = "0-1",
     max_items_per_type: int | None = None,
 ) -> dict[str, Any]:
-    """Solve knapsack optimization problems using OR-Tools."""
+    """Solve a knapsack problem with OR-Tools, without caching."""
     if not ORTOOLS_AVAILABLE:
         return {
             "status": "error",
@@ -61,92 +210,90 @@ def solve_knapsack_problem(
             }
 
         # Validate item format
-        for i, item in enumerate(items):
-            if not isinstance(item, dict):
-                return {
-                    "status": "error",
-                    "total_value": None,
-                    "selected_items": [],
-                    "execution_time": 0.0,
-                    "error_message": f"Item {i} must be a dictionary",
-                }
-
-            required_fields = ["name", "value", "weight"]
-            for field in required_fields:
-                if field not in item:
-                    return {
-                        "status": "error",
-                        "total_value": None,
-                        "selected_items": [],
-                        "execution_time": 0.0,
-                        "error_message": f"Item {i} missing required field: {field}",
-                    }
-
-            if item["value"] < 0 or item["weight"] < 0:
-                return {
-                    "status": "error",
-                    "total_value": None,
-                    "selected_items": [],
-                    "execution_time": 0.0,
-                    "error_message": f"Item {i} value and weight must be non-negative",
-                }
+        item_error = _find_item_error(items)
+        if item_error is not None:
+            return {
+                "status": "error",
+                "total_value": None,
+                "selected_items": [],
+                "execution_time": 0.0,
+                "error_message": item_error,
+            }
 
         start_time = time.time()
 
-        # Choose appropriate solver based on constraints
         has_volume_constraints = volume_capacity and any("volume" in item for item in items)
+
+        # Prepare data: how many copies of each item the solver may select
+        if knapsack_type == "unbounded":
+            # For unbounded, add multiple copies up to capacity
+            copies = [int(capacity / item["weight"]) + 1 for item in items]
+        elif knapsack_type == "bounded":
+            # For bounded, add specified quantity
+            copies = [max_items_per_type or item.get("quantity", 1) for item in items]
+        else:  # 0-1 knapsack
+            copies = [1] * len(items)
+        copy_index = np.repeat(np.arange(len(items)), np.maximum(copies, 0))
+
+        # Scale each item once for the integer solver, then expand to its copies
+        values = _scale_for_solver([item["value"] for item in items])[copy_index].tolist()
+        weights = _scale_for_solver([item["weight"] for item in items])[copy_index].tolist()
+        volumes: list[int] = []
         if has_volume_constraints:
-            # Use multidimensional solver for volume constraints
+            # Items without a volume take up no volume
+            volumes = _scale_for_solver([item.get("volume", 0) for item in items])[
+                copy_index
+            ].tolist()
+
+        # Set up constraints
+        weight_matrix = [weights]
+        capacities = [_scale_capacity(capacity)]
+        if volume_capacity and volumes:
+            weight_matrix.append(volumes)
+            capacities.append(_scale_capacity(volume_capacity))
+
+        # Dividing each constraint by its common divisor keeps the optimum and
+        # shrinks the DP table (at least 1000x per dimension for integer data)
+        for row, (constraint, limit) in enumerate(zip(weight_matrix, capacities, strict=True)):
+            divisor = math.gcd(*constraint) or 1
+            weight_matrix[row] = [amount // divisor for amount in constraint]
+            capacities[row] = limit // divisor
+
+        # Choose appropriate solver: dynamic programming is pseudo-polynomial in the
+        # capacity, so it is only used while its table stays small
+        single_dimension = len(weight_matrix) == 1
+        solver: Any
+        if (
+            single_dimension
+            and capacities[0] <= _DP_MAX_CAPACITY
+            and len(values) * capacities[0] <= _DP_MAX_CELLS
+        ):
+            algorithm = "Dynamic Programming"
             solver = knapsack_solver.KnapsackSolver(
-                knapsack_solver.KNAPSACK_MULTIDIMENSION_BRANCH_AND_BOUND_SOLVER,
-                "KnapsackSolver",
+                knapsack_solver.KNAPSACK_DYNAMIC_PROGRAMMING_SOLVER, "KnapsackSolver"
             )
-        else:
-            # Use dynamic programming for single dimension
+        elif single_dimension and len(values) <= 64:
+            # Branch and bound specialized for item sets that fit in a 64-bit mask
+            algorithm = "Branch and Bound (64 items)"
             solver = knapsack_solver.KnapsackSolver(
-                knapsack_solver.KNAPSACK_DYNAMIC_PROGRAMMING_SOLVER, "KnapsackSolver"
+                knapsack_solver.KNAPSACK_64ITEMS_SOLVER, "KnapsackSolver"
             )
-
-        # Prepare data
-        values = []
-        weights = []
-        volumes = []
-        item_names = []
-
-        for item in items:
-            quantity = item.get("quantity", 1)
-            if knapsack_type == "unbounded":
-                # For unbounded, add multiple copies up to capacity
-                max_copies = int(capacity / item["weight"]) + 1
-                for _ in range(max_copies):
-                    values.append(int(item["value"] * 1000))  # Scale for integer solver
-                    weights.append(int(item["weight"] * 1000))
-                    if volume_capacity and "volume" in item:
-                        volumes.append(int(item["volume"] * 1000))
-                    item_names.append(item["name"])
-            elif knapsack_type == "bounded":
-                # For bounded, add specified quantity
-                max_quantity = max_items_per_type or quantity
-                for _ in range(max_quantity):
-                    values.append(int(item["value"] * 1000))
-                    weights.append(int(item["weight"] * 1000))
-                    if volume_capacity and "volume" in item:
-                        volumes.append(int(item["volume"] * 1000))
-                    item_names.append(item["name"])
-            else:  # 0-1 knapsack
-                values.append(int(item["value"] * 1000))
-                weights.append(int(item["weight"] * 1000))
-                if volume_capacity and "volume" in item:
-                    volumes.append(int(item["volume"] * 1000))
-                item_names.append(item["name"])
-
-        # Set up constraints
-        capacities = [int(capacity * 1000)]
-        if volume_capacity and volumes:
-            capacities.append(int(volume_capacity * 1000))
-            weight_matrix = [weights, volumes]
+        elif (
+            not single_dimension
+            and capacities[1] >= 0
+            and min(weight_matrix[1]) >= 0
+            and (capacities[0] + 1) * (capacities[1] + 1) * (len(values) + _DP_2D_BYTES_PER_CELL)
+            <= _DP_2D_MAX_BYTES
+        ):
+            # Polynomial in the table size, unlike the multidimensional branch and bound
+            algorithm = "Dynamic Programming (weight and volume)"
+            solver = _WeightVolumeDP()
         else:
-            weight_matrix = [weights]
+            algorithm = "Branch and Bound"
+            solver = knapsack_solver.KnapsackSolver(
+                knapsack_solver.KNAPSACK_MULTIDIMENSION_BRANCH_AND_BOUND_SOLVER,
+                "KnapsackSolver",
+            )
 
         solver.init(values, weight_matrix, capacities)
 
@@ -155,6 +302,8 @@ def solve_knapsack_problem(
 
         # Solve
         computed_value = solver.solve()
+        # Branch and bound may stop at the time limit with its best solution so far
+        proven_optimal = solver.is_solution_optimal()
 
         execution_time = time.time() - start_time
 
@@ -162,21 +311,15 @@ def solve_knapsack_problem(
             # Extract solution
             selected_items = []
             total_value = 0.0
-            item_counts: dict[str, int] = {}
-
-            for i in range(len(values)):
-                if solver.best_solution_contains(i):
-                    item_name = item_names[i]
-                    original_item = next(item for item in items if item["name"] == item_name)
-
-                    if item_name in item_counts:
-                        item_counts[item_name] += 1
-                    else:
-                        item_counts[item_name] = 1
+            # Copies per original item, from one pass over the solver's selection
+            counts = np.bincount(
+                copy_index[_selected_copies(solver, len(values))], minlength=len(items)
+            )
 
-            # Create selected items list
-            for item_name, count in item_counts.items():
-                original_item = next(item for item in items if item["name"] == item_name)
+            for item_index in np.flatnonzero(counts).tolist():
+                original_item = items[item_index]
+                item_name = original_item["name"]
+                count = int(counts[item_index])
                 selected_items.append(
                     {
                         "name": item_name,
@@ -194,15 +337,13 @@ def solve_knapsack_problem(
                 total_value += original_item["value"] * count
 
             result = {
-                "status": "optimal",
+                "status": "optimal" if proven_optimal else "feasible",
                 "total_value": total_value,
                 "selected_items": selected_items,
                 "execution_time": execution_time,
                 "solver_info": {
                     "solver_name": "OR-Tools KnapsackSolver",
-                    "algorithm": "Dynamic Programming"
-                    if not has_volume_constraints
-                    else "Branch and Bound",
+                    "algorithm": algorithm,
                     "items_count": len(items),
                     "capacity": capacity,
                     "volume_capacity": volume_capacity,
@@ -210,15 +351,13 @@ def solve_knapsack_problem(
             }
         else:
             result = {
-                "status": "infeasible",
+                "status": "infeasible" if proven_optimal else "time_limit",
                 "total_value": 0.0,
                 "selected_items": [],
                 "execution_time": execution_time,
                 "solver_info": {
                     "solver_name": "OR-Tools KnapsackSolver",
-                    "algorithm": "Dynamic Programming"
-                    if not has_volume_constraints
-                    else "Branch and Bound",
+                    "algorithm": algorithm,
                     "items_count": len(items),
                     "capacity": capacity,
                     "volume_capacity": volume_capacity,
@@ -239,6 +378,49 @@ def solve_knapsack_problem(
         }
 
 
+@lru_cache(maxsize=256)
+def _solve_knapsack_json(payload: str) -> dict[str, Any]:
+    """Solve a knapsack problem given as canonical JSON, caching the result."""
+    return _solve_knapsack_problem(**json.loads(payload))
+
+
+# Define function that can be imported directly
+@with_resource_limits(timeout_seconds=60.0, estimated_memory_mb=100.0)
+def solve_knapsack_problem(
+    items: list[dict[str, Any]],
+    capacity: float,
+    volume_capacity: float | None = None,
+    knapsack_type: str = "0-1",
+    max_items_per_type: int | None = None,
+) -> dict[str, Any]:
+    """Solve knapsack optimization problems using OR-Tools.
+
+    Results for repeated inputs are served from a cache unless the
+    ``knapsack_cache`` setting is disabled.
+    """
+    start_time = time.time()
+    arguments: dict[str, Any] = {
+        "items": items,
+        "capacity": capacity,
+        "volume_capacity": volume_capacity,
+        "knapsack_type": knapsack_type,
+        "max_items_per_type": max_items_per_type,
+    }
+    payload = canonical_json(arguments) if settings.knapsack_cache else None
+    if payload is None:
+        return _solve_knapsack_problem(**arguments)
+
+    # Copy so callers cannot modify the cached result
+    result = copy.deepcopy(_solve_knapsack_json(payload))
+    result["execution_time"] = time.time() - start_time
+    return result
+
+
+def knapsack_cache_info() -> _CacheInfo:
+    """Return hit/miss statistics of the knapsack result cache."""
+    return _solve_knapsack_json.cache_info()
+
+
 def register_knapsack_tools(mcp: FastMCP[Any]) -> None:
     """Register knapsack problem tools with the MCP server."""
 
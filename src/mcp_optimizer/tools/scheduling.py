@@ -5,20 +5,21 @@ This module provides tools for solving scheduling problems including:
 - Shift Scheduling
 """
 
+import importlib.util
 import logging
 import time
 from typing import Any
 
 from fastmcp import FastMCP
 
+# cp_model pulls in pandas, so only check that it is installed here and
+# import it when a scheduling problem is actually solved
 try:
-    from ortools.sat.python import cp_model
-
-    ORTOOLS_AVAILABLE = True
-except ImportError as e:
-    logging.warning(f"OR-Tools not available for scheduling: {e}")
-    cp_model = None  # type: ignore[assignment]
+    ORTOOLS_AVAILABLE = importlib.util.find_spec("ortools.sat.python.cp_model") is not None
+except ImportError:
     ORTOOLS_AVAILABLE = False
+if not ORTOOLS_AVAILABLE:
+    logging.warning("OR-Tools not available for scheduling")
 
 from pydantic import BaseModel, Field, ValidationInfo, field_validator
 
@@ -149,6 +150,8 @@ def solve_job_scheduling(input_data: dict[str, Any]) -> OptimizationResult:
             error_message="OR-Tools is not available. Please install it with 'pip install ortools'",
         )
 
+    from ortools.sat.python import cp_model
+
     start_time = time.time()
 
     try:
@@ -324,6 +327,8 @@ def solve_shift_scheduling(input_data: dict[str, Any]) -> OptimizationResult:
             error_message="OR-Tools is not available. Please install it with 'pip install ortools'",
         )
 
+    from ortools.sat.python import cp_model
+
     start_time = time.time()
 
     try:
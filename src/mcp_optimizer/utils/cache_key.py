@@ -0,0 +1,16 @@
+"""Cache keys for solver inputs."""
+
+import json
+from typing import Any
+
+
+def canonical_json(data: Any) -> str | None:
+    """Encode input as canonical JSON for use as a cache key.
+
+    Returns None if the data is not plain JSON (e.g. model instances or NaN),
+    in which case the caller should not cache.
+    """
+    try:
+        return json.dumps(data, sort_keys=True, allow_nan=False)
+    except (TypeError, ValueError):
+        return None
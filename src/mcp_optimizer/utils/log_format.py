@@ -0,0 +1,76 @@
+"""Structured log formatting for MCP Optimizer."""
+
+import json
+import logging
+import time
+from typing import Any
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+    ORJSON_AVAILABLE = False
+
+
+def _dumps_json(payload: dict[str, Any]) -> str:
+    """Serialize a log payload with the standard library encoder."""
+    return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+def _dumps_orjson(payload: dict[str, Any]) -> str:
+    """Serialize a log payload with orjson."""
+    return orjson.dumps(payload, default=str).decode()
+
+
+class CachedTimeFormatter(logging.Formatter):
+    """Formatter that reuses the formatted timestamp within the same second.
+
+    ``strftime`` only has second resolution, so records logged in the same
+    second share one formatted string instead of converting the time again.
+    """
+
+    def __init__(self, fmt: str | None = None, datefmt: str | None = None) -> None:
+        """Initialize formatter with an empty timestamp cache."""
+        super().__init__(fmt=fmt, datefmt=datefmt)
+        self._cached_time: tuple[int, str | None, str] = (-1, None, "")
+
+    def formatTime(self, record: logging.LogRecord, datefmt: str | None = None) -> str:
+        """Return the creation time of the record, cached per second."""
+        second = int(record.created)
+        cached_second, cached_datefmt, formatted = self._cached_time
+        if second != cached_second or datefmt != cached_datefmt:
+            formatted = time.strftime(
+                datefmt or self.default_time_format, self.converter(record.created)
+            )
+            # Single tuple assignment keeps the cache consistent across threads
+            self._cached_time = (second, datefmt, formatted)
+        if datefmt or not self.default_msec_format:
+            return formatted
+        return self.default_msec_format % (formatted, record.msecs)
+
+
+class JsonFormatter(CachedTimeFormatter):
+    """Format log records as single-line JSON objects.
+
+    Records are serialized with a real JSON encoder, so quotes, backslashes and
+    newlines in messages are escaped correctly. orjson is used when installed.
+    """
+
+    def __init__(self, datefmt: str | None = "%Y-%m-%dT%H:%M:%S") -> None:
+        """Initialize formatter with the timestamp format."""
+        super().__init__(datefmt=datefmt)
+        self._dumps = _dumps_orjson if ORJSON_AVAILABLE else _dumps_json
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Format a log record as JSON."""
+        payload: dict[str, Any] = {
+            "timestamp": self.formatTime(record, self.datefmt),
+            "level": record.levelname,
+            "module": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            payload["exception"] = self.formatException(record.exc_info)
+        return self._dumps(payload)
@@ -0,0 +1,112 @@
+"""Buffered log output for MCP Optimizer."""
+
+import errno
+import logging
+import os
+import sys
+import threading
+import time
+
+
+class BufferedStderrHandler(logging.Handler):
+    """Log handler that batches formatted records into few ``write()`` calls.
+
+    Records are appended to an in-memory buffer that a background thread
+    writes out ``flush_interval`` seconds after the first pending record, or
+    immediately once ``max_buffer_bytes`` is reached. Records at ERROR level
+    and above, and records emitted after ``close()``, are written straight away
+    so they are never held back.
+
+    Output goes to the process-level stderr descriptor (fd 2) by default. If
+    that descriptor is not open, records are written to ``sys.stderr`` instead.
+    """
+
+    def __init__(
+        self,
+        fd: int = 2,
+        flush_interval: float = 0.005,
+        max_buffer_bytes: int = 64 * 1024,
+        level: int = logging.NOTSET,
+    ) -> None:
+        """Initialize handler writing to the given file descriptor."""
+        super().__init__(level)
+        self.fd = fd
+        self.flush_interval = flush_interval
+        self.max_buffer_bytes = max_buffer_bytes
+        self._buffer = bytearray()
+        self._pending = threading.Event()
+        self._closed = False
+        self._flusher: threading.Thread | None = None
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Buffer a formatted record, writing out when needed."""
+        try:
+            data = (self.format(record) + "\n").encode("utf-8", "backslashreplace")
+        except Exception:
+            self.handleError(record)
+            return
+
+        with self.lock:  # type: ignore[union-attr]
+            self._buffer += data
+            if (
+                self._closed
+                or record.levelno >= logging.ERROR
+                or len(self._buffer) >= self.max_buffer_bytes
+            ):
+                self._write_buffer()
+                return
+            if self._flusher is None:
+                self._flusher = threading.Thread(
+                    target=self._run_flusher, name="mcp-optimizer-log-flusher", daemon=True
+                )
+                self._flusher.start()
+        self._pending.set()
+
+    def flush(self) -> None:
+        """Write out all buffered records."""
+        with self.lock:  # type: ignore[union-attr]
+            self._write_buffer()
+
+    def close(self) -> None:
+        """Flush remaining records and stop the background flusher."""
+        self._closed = True
+        self._pending.set()
+        self.flush()
+        super().close()
+
+    def _write_buffer(self) -> None:
+        """Write the buffer to the file descriptor. Caller must hold the lock."""
+        view = memoryview(self._buffer)
+        try:
+            while view:
+                written = os.write(self.fd, view)
+                view = view[written:]
+        except OSError as e:
+            if e.errno == errno.EBADF:
+                self._write_fallback(bytes(view))
+            # Otherwise the stream is gone (e.g. the client closed stderr); drop the logs
+        finally:
+            view.release()
+            self._buffer.clear()
+
+    @staticmethod
+    def _write_fallback(data: bytes) -> None:
+        """Write records through ``sys.stderr`` when the descriptor is not open."""
+        stream = sys.stderr
+        if stream is None:
+            return
+        try:
+            stream.write(data.decode("utf-8", "replace"))
+            stream.flush()
+        except (OSError, ValueError):
+            pass
+
+    def _run_flusher(self) -> None:
+        """Flush pending records shortly after they arrive."""
+        while not self._closed:
+            self._pending.wait()
+            self._pending.clear()
+            if not self._closed:
+                # Let records arriving within the interval share one write
+                time.sleep(self.flush_interval)
+            self.flush()
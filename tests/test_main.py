@@ -1,18 +1,21 @@
 """Comprehensive tests for main.py module."""
 
 import logging
+import sys
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 from mcp_optimizer.config import TransportMode, settings
 from mcp_optimizer.main import (
+    _install_uvloop,
     cli_main,
     main,
     parse_args,
     run_stdio_server,
     setup_logging,
 )
+from mcp_optimizer.utils.log_format import CachedTimeFormatter, JsonFormatter
 
 
 class TestSetupLogging:
@@ -30,8 +33,7 @@ class TestSetupLogging:
             mock_basic_config.assert_called_once()
             args, kwargs = mock_basic_config.call_args
             assert kwargs["level"] == logging.INFO
-            assert '"timestamp"' in kwargs["format"]
-            assert '"level"' in kwargs["format"]
+            assert isinstance(kwargs["handlers"][0].formatter, JsonFormatter)
 
     @patch("mcp_optimizer.main.logging.basicConfig")
     def test_setup_logging_human_format(self, mock_basic_config):
@@ -45,8 +47,10 @@ class TestSetupLogging:
             mock_basic_config.assert_called_once()
             args, kwargs = mock_basic_config.call_args
             assert kwargs["level"] == logging.DEBUG
-            assert "asctime" in kwargs["format"]
-            assert "name" in kwargs["format"]
+            formatter = kwargs["handlers"][0].formatter
+            assert isinstance(formatter, CachedTimeFormatter)
+            assert "asctime" in formatter._fmt
+            assert "name" in formatter._fmt
 
     @patch("mcp_optimizer.main.logging.basicConfig")
     def test_setup_logging_different_levels(self, mock_basic_config):
@@ -68,7 +72,7 @@ class TestSetupLogging:
 class TestRunStdioServer:
     """Tests for run_stdio_server function."""
 
-    @patch("mcp_optimizer.main.create_mcp_server")
+    @patch("mcp_optimizer.mcp_server.create_mcp_server")
     @patch("mcp_optimizer.main.logging.info")
     def test_run_stdio_server(self, mock_logging, mock_create_server):
         """Test running stdio server."""
@@ -199,11 +203,18 @@ class TestMain:
 
     @patch("mcp_optimizer.main.parse_args")
     @patch("mcp_optimizer.main.setup_logging")
+    @patch("mcp_optimizer.main._install_uvloop")
     @patch("asyncio.run")
     @patch("mcp_optimizer.main.run_sse_server")
     @patch("mcp_optimizer.main.settings")
     def test_main_sse_transport(
-        self, mock_settings, mock_run_sse, mock_asyncio_run, mock_setup_logging, mock_parse_args
+        self,
+        mock_settings,
+        mock_run_sse,
+        mock_asyncio_run,
+        mock_install_uvloop,
+        mock_setup_logging,
+        mock_parse_args,
     ):
         """Test main function with SSE transport."""
         # Setup mock args
@@ -226,6 +237,7 @@ class TestMain:
         main()
 
         mock_setup_logging.assert_called_once()
+        mock_install_uvloop.assert_called_once()
         mock_asyncio_run.assert_called_once()
 
     @patch("mcp_optimizer.main.parse_args")
@@ -330,7 +342,10 @@ class TestMain:
     def test_settings_update_from_args(self, mock_settings):
         """Test that settings are updated from command line arguments."""
         with patch("mcp_optimizer.main.parse_args") as mock_parse_args:
-            with patch("mcp_optimizer.main.setup_logging"):
+            with (
+                patch("mcp_optimizer.main.setup_logging"),
+                patch("mcp_optimizer.main._install_uvloop"),
+            ):
                 with patch("mcp_optimizer.main.run_stdio_server"):
                     with patch("asyncio.run") as mock_asyncio_run:
                         with patch("mcp_optimizer.main.run_sse_server", spec=True) as mock_run_sse:
@@ -364,6 +379,27 @@ class TestMain:
                             mock_asyncio_run.assert_called_once()
 
 
+class TestInstallUvloop:
+    """Tests for _install_uvloop function."""
+
+    @patch("asyncio.set_event_loop_policy")
+    def test_install_uvloop_sets_policy(self, mock_set_policy):
+        """Test that uvloop's policy is installed when uvloop is importable."""
+        mock_uvloop = MagicMock()
+        with patch.dict(sys.modules, {"uvloop": mock_uvloop}):
+            _install_uvloop()
+
+        mock_set_policy.assert_called_once_with(mock_uvloop.EventLoopPolicy.return_value)
+
+    @patch("asyncio.set_event_loop_policy")
+    def test_install_uvloop_missing(self, mock_set_policy):
+        """Test that the default loop is kept when uvloop is not installed."""
+        with patch.dict(sys.modules, {"uvloop": None}):
+            _install_uvloop()
+
+        mock_set_policy.assert_not_called()
+
+
 class TestCliMain:
     """Tests for cli_main function."""
 
@@ -388,7 +424,7 @@ class TestCliMain:
 class TestAsyncRunSSEServer:
     """Tests for run_sse_server function."""
 
-    @patch("mcp_optimizer.main.create_mcp_server")
+    @patch("mcp_optimizer.mcp_server.create_mcp_server")
     @patch("mcp_optimizer.main.uvicorn.Server")
     @patch("mcp_optimizer.main.uvicorn.Config")
     @patch("mcp_optimizer.main.logging.info")
@@ -428,3 +464,16 @@ class TestMCPObjectExport:
         # The mcp object should be a FastMCP instance
         assert hasattr(mcp, "run")
         assert hasattr(mcp, "tool")
+
+    def test_mcp_object_is_built_once(self):
+        """Test that the lazily exported mcp object is cached on the module."""
+        import mcp_optimizer.main as main_module
+
+        assert main_module.mcp is main_module.mcp
+
+    def test_unknown_attribute_raises(self):
+        """Test that lazy attribute lookup does not swallow unknown names."""
+        import mcp_optimizer.main as main_module
+
+        with pytest.raises(AttributeError):
+            _ = main_module.not_a_real_attribute
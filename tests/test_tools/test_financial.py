@@ -1,17 +1,22 @@
 """Tests for financial optimization tools."""
 
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
+import numpy as np
 import pytest
+from pydantic import ValidationError
 
 from mcp_optimizer.schemas.base import OptimizationStatus
 from mcp_optimizer.tools.financial import (
     Asset,
     PortfolioInput,
     optimize_portfolio,
+    portfolio_input_cache_info,
+    portfolio_result_cache_info,
     register_financial_tools,
     solve_portfolio_optimization,
     solve_risk_parity_portfolio,
+    validate_portfolio_input,
 )
 
 
@@ -66,6 +71,12 @@ class TestAsset:
                 max_allocation=0.2,
             )
 
+    def test_asset_is_immutable(self):
+        """Test that validated assets cannot be modified in place."""
+        asset = Asset(name="TEST", expected_return=0.10, risk=0.15)
+        with pytest.raises(ValidationError):
+            asset.max_allocation = 0.5
+
 
 class TestPortfolioInput:
     """Test PortfolioInput model."""
@@ -119,6 +130,7 @@ class TestPortfolioInput:
             correlation_matrix=correlation_matrix,
         )
         assert portfolio_input.correlation_matrix == correlation_matrix
+        assert portfolio_input.correlation.tolist() == correlation_matrix
 
         # Invalid dimensions
         with pytest.raises(ValueError, match="Correlation matrix dimensions must match"):
@@ -148,6 +160,118 @@ class TestPortfolioInput:
             )
 
 
+class TestPortfolioInputCache:
+    """Test caching of validated portfolio input."""
+
+    def test_identical_input_reuses_model(self):
+        """Test identical inputs are validated once, regardless of key order."""
+        input_data = {
+            "assets": [{"name": "CACHE_A", "expected_return": 0.1, "risk": 0.2}],
+            "budget": 1000.0,
+            "risk_tolerance": 0.3,
+        }
+        reordered = {key: input_data[key] for key in reversed(input_data)}
+
+        first = validate_portfolio_input(input_data)
+        hits = portfolio_input_cache_info().hits
+        second = validate_portfolio_input(reordered)
+
+        assert second is first
+        assert portfolio_input_cache_info().hits == hits + 1
+
+    def test_cached_input_is_immutable(self):
+        """Test a shared cached input cannot be modified by one caller."""
+        portfolio_input = validate_portfolio_input(
+            {
+                "assets": [
+                    {"name": "FROZEN_A", "expected_return": 0.12, "risk": 0.15},
+                    {"name": "FROZEN_B", "expected_return": 0.08, "risk": 0.10},
+                ],
+                "budget": 1000.0,
+                "risk_tolerance": 0.2,
+                "correlation_matrix": [[1.0, 0.3], [0.3, 1.0]],
+            }
+        )
+
+        with pytest.raises(ValidationError):
+            portfolio_input.budget = 2000.0
+        with pytest.raises(ValueError, match="read-only"):
+            portfolio_input.correlation[0, 1] = 0.9
+
+    def test_non_json_input_is_validated(self):
+        """Test inputs that cannot be encoded as JSON bypass the cache."""
+        asset = Asset(name="AAPL", expected_return=0.12, risk=0.15)
+
+        portfolio_input = validate_portfolio_input(
+            {"assets": [asset], "budget": 1000.0, "risk_tolerance": 0.2}
+        )
+
+        assert portfolio_input.assets == [asset]
+
+    def test_invalid_input_raises(self):
+        """Test cached validation still rejects invalid input."""
+        with pytest.raises(ValueError, match="At least one asset required"):
+            validate_portfolio_input({"assets": [], "budget": 1000.0, "risk_tolerance": 0.2})
+
+
+class TestPortfolioResultCache:
+    """Test caching of portfolio optimization results."""
+
+    @pytest.fixture
+    def input_data(self):
+        """Portfolio input used only by the result cache tests."""
+        return {
+            "assets": [
+                {"name": "RESULT_A", "expected_return": 0.12, "risk": 0.15},
+                {"name": "RESULT_B", "expected_return": 0.08, "risk": 0.10},
+            ],
+            "budget": 5000.0,
+            "risk_tolerance": 0.2,
+        }
+
+    def test_repeated_input_reuses_result(self, input_data):
+        """Test a repeated query is served from the cache with its own timing."""
+        first = solve_portfolio_optimization(input_data)
+        hits = portfolio_result_cache_info().hits
+        second = solve_portfolio_optimization(input_data)
+
+        assert portfolio_result_cache_info().hits == hits + 1
+        assert second.status == OptimizationStatus.OPTIMAL
+        assert second.variables == first.variables
+        assert second.execution_time >= 0
+
+    def test_cached_result_is_not_shared(self, input_data):
+        """Test modifying a returned result does not change later results."""
+        first = solve_portfolio_optimization(input_data)
+        first.variables["portfolio_allocation"]["RESULT_A"]["amount"] = -1.0
+
+        second = solve_portfolio_optimization(input_data)
+
+        assert second.variables["portfolio_allocation"]["RESULT_A"]["amount"] == pytest.approx(
+            5000.0
+        )
+
+    def test_no_cache_bypasses_cache(self, input_data):
+        """Test the no_cache flag solves the problem again."""
+        solve_portfolio_optimization(input_data)
+        cache_info = portfolio_result_cache_info()
+
+        result = solve_portfolio_optimization({**input_data, "no_cache": True})
+
+        assert result.status == OptimizationStatus.OPTIMAL
+        assert portfolio_result_cache_info() == cache_info
+
+    def test_risk_parity_result_is_not_shared(self, input_data):
+        """Test cached risk parity results are returned as independent copies."""
+        first = solve_risk_parity_portfolio(input_data)
+        first.variables["portfolio_metrics"]["portfolio_risk"] = -1.0
+
+        second = solve_risk_parity_portfolio(input_data)
+
+        assert second.status == OptimizationStatus.OPTIMAL
+        assert second.variables["portfolio_metrics"]["portfolio_risk"] > 0
+
+
 class TestPortfolioOptimization:
     """Test Portfolio Optimization functions."""
 
@@ -201,6 +325,109 @@ class TestPortfolioOptimization:
         # Correlation matrix optimization is complex and may fail with linear programming
         assert result.status in [OptimizationStatus.OPTIMAL, OptimizationStatus.ERROR]
 
+    def test_minimize_risk_uses_correlation(self):
+        """Test that minimize risk accounts for correlations between assets."""
+        input_data = {
+            "assets": [
+                {"name": "AAPL", "expected_return": 0.12, "risk": 0.15},
+                {"name": "MSFT", "expected_return": 0.10, "risk": 0.12},
+                {"name": "GLD", "expected_return": 0.05, "risk": 0.20},
+            ],
+            "budget": 1000.0,
+            "risk_tolerance": 0.0,
+            "objective": "minimize_risk",
+            "correlation_matrix": [[1.0, 0.9, -0.5], [0.9, 1.0, -0.4], [-0.5, -0.4, 1.0]],
+        }
+
+        result = solve_portfolio_optimization(input_data)
+        assert result.status == OptimizationStatus.OPTIMAL
+        assert result.solver_info["solver_name"] == "SciPy SLSQP"
+        # GLD has the highest individual risk but hedges the correlated stocks
+        allocation = result.variables["portfolio_allocation"]
+        assert allocation["GLD"]["weight"] > 0.3
+        # Diversified variance is below the least risky single asset (0.12 ** 2)
+        assert result.objective_value < 0.0144
+
+        # Without SciPy the linear covariance proxy still favors the hedge
+        with patch("mcp_optimizer.tools.financial.SCIPY_AVAILABLE", False):
+            result = solve_portfolio_optimization(input_data)
+        assert result.status == OptimizationStatus.OPTIMAL
+        assert result.variables["portfolio_allocation"]["GLD"]["amount"] == pytest.approx(1000.0)
+
+    def test_minimize_risk_minimum_variance(self):
+        """Test minimize risk finds the analytic two-asset minimum-variance portfolio."""
+        input_data = {
+            "assets": [
+                {"name": "AAPL", "expected_return": 0.12, "risk": 0.15},
+                {"name": "MSFT", "expected_return": 0.10, "risk": 0.12},
+            ],
+            "budget": 10000.0,
+            "risk_tolerance": 0.2,
+            "objective": "minimize_risk",
+            "correlation_matrix": [[1.0, 0.3], [0.3, 1.0]],
+        }
+
+        result = solve_portfolio_optimization(input_data)
+        assert result.status == OptimizationStatus.OPTIMAL
+        # w = (s2^2 - rho s1 s2) / (s1^2 + s2^2 - 2 rho s1 s2) = 0.009 / 0.0261
+        allocation = result.variables["portfolio_allocation"]
+        assert allocation["AAPL"]["weight"] == pytest.approx(0.009 / 0.0261, abs=1e-4)
+        assert result.objective_value == pytest.approx(0.0112966, abs=1e-6)
+        metrics = result.variables["portfolio_metrics"]
+        assert metrics["portfolio_std"] == pytest.approx(0.0112966**0.5, abs=1e-5)
+
+    def test_minimize_risk_rejects_infeasible_qp_solution(self):
+        """Test an SLSQP result that breaks the constraints falls back to the LP."""
+        input_data = {
+            "assets": [
+                {"name": "AAPL", "expected_return": 0.12, "risk": 0.15},
+                {"name": "MSFT", "expected_return": 0.10, "risk": 0.12},
+            ],
+            "budget": 10000.0,
+            "risk_tolerance": 0.2,
+            "objective": "minimize_risk",
+            "correlation_matrix": [[1.0, 0.3], [0.3, 1.0]],
+            "no_cache": True,
+        }
+        infeasible = Mock(success=True, x=np.array([0.9, 0.3]))
+
+        with patch("scipy.optimize.minimize", return_value=infeasible):
+            result = solve_portfolio_optimization(input_data)
+
+        assert result.status == OptimizationStatus.OPTIMAL
+        assert result.solver_info["solver_name"] == "SciPy HiGHS"
+        assert result.solver_info["approximation"] == "linear covariance proxy"
+        weights = [item["weight"] for item in result.variables["portfolio_allocation"].values()]
+        assert sum(weights) == pytest.approx(1.0)
+
+    @pytest.mark.parametrize("scipy_available", [True, False])
+    def test_minimize_risk_fallback_reports_variance(self, scipy_available):
+        """Test the linear proxy fallback reports the portfolio variance and is flagged."""
+        input_data = {
+            "assets": [
+                {"name": "AAPL", "expected_return": 0.12, "risk": 0.15},
+                {"name": "MSFT", "expected_return": 0.10, "risk": 0.12},
+            ],
+            "budget": 10000.0,
+            "risk_tolerance": 0.2,
+            "objective": "minimize_risk",
+            "correlation_matrix": [[1.0, 0.3], [0.3, 1.0]],
+            "no_cache": True,
+        }
+
+        with (
+            patch("mcp_optimizer.tools.financial._QP_MAX_ASSETS", 1),
+            patch("mcp_optimizer.tools.financial.SCIPY_AVAILABLE", scipy_available),
+        ):
+            result = solve_portfolio_optimization(input_data)
+
+        assert result.status == OptimizationStatus.OPTIMAL
+        assert result.solver_info["approximation"] == "linear covariance proxy"
+        allocation = result.variables["portfolio_allocation"]
+        weights = np.array([allocation["AAPL"]["weight"], allocation["MSFT"]["weight"]])
+        covariance = np.outer([0.15, 0.12], [0.15, 0.12]) * np.array([[1.0, 0.3], [0.3, 1.0]])
+        assert result.objective_value == pytest.approx(weights @ covariance @ weights)
+
     def test_sharpe_ratio_objective(self):
         """Test portfolio optimization with sharpe ratio objective."""
         input_data = {
@@ -217,6 +444,24 @@ class TestPortfolioOptimization:
         result = solve_portfolio_optimization(input_data)
         assert result.status == OptimizationStatus.OPTIMAL
 
+    def test_sharpe_ratio_is_maximized(self):
+        """Test sharpe ratio objective picks the best risk-adjusted asset."""
+        input_data = {
+            "assets": [
+                {"name": "AAPL", "expected_return": 0.12, "risk": 0.15},
+                {"name": "MSFT", "expected_return": 0.10, "risk": 0.12},
+            ],
+            "budget": 10000.0,
+            "risk_tolerance": 0.5,
+            "objective": "sharpe_ratio",
+        }
+
+        result = solve_portfolio_optimization(input_data)
+        assert result.status == OptimizationStatus.OPTIMAL
+        # Risk penalty is 1 / 0.5 = 2: AAPL scores -0.18, MSFT scores -0.14
+        assert result.variables["portfolio_allocation"]["MSFT"]["amount"] == pytest.approx(10000.0)
+        assert result.objective_value == pytest.approx(-0.14)
+
     def test_sector_constraints(self):
         """Test portfolio optimization with sector constraints."""
         input_data = {
@@ -232,6 +477,14 @@ class TestPortfolioOptimization:
 
         result = solve_portfolio_optimization(input_data)
         assert result.status == OptimizationStatus.OPTIMAL
+        assert result.variables["sector_allocation"] == pytest.approx(
+            {"Tech": 0.6, "Healthcare": 0.4}
+        )
+        metrics = result.variables["portfolio_metrics"]
+        assert metrics["total_allocation"] == pytest.approx(10000.0)
+        assert metrics["expected_return"] == pytest.approx(0.6 * 0.12 + 0.4 * 0.08)
+        # Without a correlation matrix the std falls back to the weighted risk
+        assert metrics["portfolio_std"] == pytest.approx(metrics["portfolio_risk"])
 
     def test_asset_allocation_bounds(self):
         """Test portfolio optimization with asset allocation bounds."""
@@ -285,6 +538,80 @@ class TestPortfolioOptimization:
         result = solve_portfolio_optimization(input_data)
         assert result.status in [OptimizationStatus.INFEASIBLE, OptimizationStatus.UNBOUNDED]
 
+    def test_conflicting_allocation_limits(self):
+        """Test asset maximum below the global minimum fails before solving."""
+        input_data = {
+            "assets": [
+                {"name": "AAPL", "expected_return": 0.12, "risk": 0.15, "max_allocation": 0.3},
+                {"name": "MSFT", "expected_return": 0.10, "risk": 0.12},
+            ],
+            "budget": 10000.0,
+            "risk_tolerance": 0.2,
+            "min_allocation": 0.4,
+        }
+
+        result = solve_portfolio_optimization(input_data)
+        assert result.status == OptimizationStatus.INFEASIBLE
+        assert "AAPL" in result.error_message
+        assert "MSFT" not in result.error_message
+
+    def test_single_asset_skips_solver(self):
+        """Test a single asset receives the whole budget without running a solver."""
+        input_data = {
+            "assets": [{"name": "AAPL", "expected_return": 0.12, "risk": 0.15}],
+            "budget": 10000.0,
+            "risk_tolerance": 0.2,
+        }
+
+        result = solve_portfolio_optimization(input_data)
+        assert result.status == OptimizationStatus.OPTIMAL
+        assert result.solver_info["solver_name"] == "Analytic"
+        assert result.variables["portfolio_allocation"]["AAPL"]["amount"] == pytest.approx(10000.0)
+        assert result.objective_value == pytest.approx(0.12)
+
+    def test_minimum_allocations_force_solution(self):
+        """Test minimum allocations summing to one fix the allocation."""
+        input_data = {
+            "assets": [
+                {"name": "AAPL", "expected_return": 0.12, "risk": 0.15, "min_allocation": 0.6},
+                {"name": "MSFT", "expected_return": 0.10, "risk": 0.12, "min_allocation": 0.4},
+            ],
+            "budget": 10000.0,
+            "risk_tolerance": 0.2,
+        }
+
+        result = solve_portfolio_optimization(input_data)
+        assert result.status == OptimizationStatus.OPTIMAL
+        assert result.solver_info["solver_name"] == "Analytic"
+        allocation = result.variables["portfolio_allocation"]
+        assert allocation["AAPL"]["amount"] == pytest.approx(6000.0)
+        assert allocation["MSFT"]["amount"] == pytest.approx(4000.0)
+
+    def test_minimum_allocations_exceed_budget(self):
+        """Test minimum allocations above the budget are infeasible."""
+        input_data = {
+            "assets": [
+                {"name": "AAPL", "expected_return": 0.12, "risk": 0.15, "min_allocation": 0.7},
+                {"name": "MSFT", "expected_return": 0.10, "risk": 0.12, "min_allocation": 0.4},
+            ],
+            "budget": 10000.0,
+            "risk_tolerance": 0.2,
+        }
+
+        result = solve_portfolio_optimization(input_data)
+        assert result.status == OptimizationStatus.INFEASIBLE
+
+    def test_forced_solution_violating_risk_tolerance(self):
+        """Test a forced allocation is still checked against the constraints."""
+        input_data = {
+            "assets": [{"name": "AAPL", "expected_return": 0.12, "risk": 0.15}],
+            "budget": 10000.0,
+            "risk_tolerance": 0.1,
+        }
+
+        result = solve_portfolio_optimization(input_data)
+        assert result.status == OptimizationStatus.INFEASIBLE
+
     def test_invalid_input_data(self):
         """Test portfolio optimization with invalid input data."""
         result = solve_portfolio_optimization({"assets": [], "budget": 10000.0})
@@ -292,6 +619,47 @@ class TestPortfolioOptimization:
         assert "At least one asset required" in result.error_message
 
 
+class TestPortfolioSolverBackends:
+    """Test that the HiGHS and PuLP backends solve the same portfolio LP."""
+
+    INPUT_DATA = {
+        "assets": [
+            {"name": "AAPL", "expected_return": 0.12, "risk": 0.15, "sector": "Tech"},
+            {"name": "MSFT", "expected_return": 0.10, "risk": 0.12, "sector": "Tech"},
+            {"name": "JNJ", "expected_return": 0.08, "risk": 0.10, "sector": "Healthcare"},
+        ],
+        # Large budget: coefficients must stay well scaled for CBC
+        "budget": 1_000_000.0,
+        "risk_tolerance": 0.14,
+        "max_allocation": 0.7,
+        "sector_limits": {"Tech": 0.8},
+    }
+
+    @pytest.mark.parametrize("objective", ["maximize_return", "minimize_risk", "sharpe_ratio"])
+    def test_backends_agree(self, objective):
+        """Test HiGHS and PuLP return the same optimum."""
+        input_data = {**self.INPUT_DATA, "objective": objective}
+
+        highs_result = solve_portfolio_optimization(input_data)
+        with patch("mcp_optimizer.tools.financial.SCIPY_AVAILABLE", False):
+            pulp_result = solve_portfolio_optimization(input_data)
+
+        assert highs_result.status == OptimizationStatus.OPTIMAL
+        assert pulp_result.status == OptimizationStatus.OPTIMAL
+        assert highs_result.solver_info["solver_name"] == "SciPy HiGHS"
+        assert pulp_result.solver_info["solver_name"] == "PuLP CBC"
+        assert highs_result.objective_value == pytest.approx(pulp_result.objective_value)
+
+    def test_backends_report_infeasible(self):
+        """Test both backends report infeasible problems."""
+        input_data = {**self.INPUT_DATA, "risk_tolerance": 0.05}
+
+        assert solve_portfolio_optimization(input_data).status == OptimizationStatus.INFEASIBLE
+        with patch("mcp_optimizer.tools.financial.SCIPY_AVAILABLE", False):
+            result = solve_portfolio_optimization(input_data)
+        assert result.status == OptimizationStatus.INFEASIBLE
+
+
 class TestRiskParityPortfolio:
     """Test Risk Parity Portfolio functions."""
 
@@ -327,6 +695,80 @@ class TestRiskParityPortfolio:
         result = solve_risk_parity_portfolio(input_data)
         assert result.status == OptimizationStatus.OPTIMAL
 
+    def test_risk_parity_equal_contributions(self):
+        """Test unconstrained risk parity gives equal risk contributions."""
+        input_data = {
+            "assets": [
+                {"name": "AAPL", "expected_return": 0.12, "risk": 0.15},
+                {"name": "BONDS", "expected_return": 0.04, "risk": 0.03},
+                {"name": "CASH", "expected_return": 0.01, "risk": 0.0},
+            ],
+            "budget": 10000.0,
+            "risk_tolerance": 0.2,
+        }
+
+        result = solve_risk_parity_portfolio(input_data)
+        allocation = result.variables["portfolio_allocation"]
+        assert allocation["AAPL"]["weight"] == pytest.approx(1 / 6)
+        assert allocation["BONDS"]["weight"] == pytest.approx(5 / 6)
+        assert allocation["CASH"]["amount"] == 0.0
+        assert allocation["AAPL"]["risk_contribution"] == pytest.approx(0.025)
+        assert allocation["BONDS"]["risk_contribution"] == pytest.approx(0.025)
+
+    def test_risk_parity_metrics_after_normalization(self):
+        """Test metrics reflect the weights after clipping and renormalizing."""
+        input_data = {
+            "assets": [
+                {"name": "AAPL", "expected_return": 0.12, "risk": 0.15},
+                {"name": "BONDS", "expected_return": 0.04, "risk": 0.03, "max_allocation": 0.5},
+            ],
+            "budget": 10000.0,
+            "risk_tolerance": 0.2,
+        }
+
+        result = solve_risk_parity_portfolio(input_data)
+        allocation = result.variables["portfolio_allocation"]
+        metrics = result.variables["portfolio_metrics"]
+        # BONDS would get 5/6 but is capped at 1/2; AAPL takes the rest of the budget
+        assert allocation["AAPL"]["amount"] == pytest.approx(5000.0)
+        assert allocation["BONDS"]["amount"] == pytest.approx(5000.0)
+        assert metrics["expected_return"] == pytest.approx(0.5 * 0.12 + 0.5 * 0.04)
+        assert metrics["portfolio_risk"] == pytest.approx(0.5 * 0.15 + 0.5 * 0.03)
+
+    def test_risk_parity_redistributes_within_bounds(self):
+        """Test capped weight goes to uncapped assets in proportion to inverse risk."""
+        input_data = {
+            "assets": [
+                {"name": "AAPL", "expected_return": 0.12, "risk": 0.20},
+                {"name": "MSFT", "expected_return": 0.10, "risk": 0.10},
+                {"name": "BONDS", "expected_return": 0.04, "risk": 0.02, "max_allocation": 0.4},
+            ],
+            "budget": 1000.0,
+            "risk_tolerance": 0.2,
+        }
+
+        result = solve_risk_parity_portfolio(input_data)
+        allocation = result.variables["portfolio_allocation"]
+        # AAPL and MSFT share the remaining 0.6 in the ratio 1/0.20 : 1/0.10
+        assert allocation["BONDS"]["weight"] == pytest.approx(0.4)
+        assert allocation["AAPL"]["weight"] == pytest.approx(0.2)
+        assert allocation["MSFT"]["weight"] == pytest.approx(0.4)
+
+    def test_risk_parity_infeasible_bounds(self):
+        """Test allocation limits that cannot cover the budget are reported infeasible."""
+        input_data = {
+            "assets": [
+                {"name": "AAPL", "expected_return": 0.12, "risk": 0.15, "max_allocation": 0.3},
+                {"name": "BONDS", "expected_return": 0.04, "risk": 0.03, "max_allocation": 0.3},
+            ],
+            "budget": 1000.0,
+            "risk_tolerance": 0.2,
+        }
+
+        result = solve_risk_parity_portfolio(input_data)
+
+        assert result.status == OptimizationStatus.INFEASIBLE
+
 
 class TestOptimizePortfolio:
     """Test optimize_portfolio wrapper function."""
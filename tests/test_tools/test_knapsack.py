@@ -1,8 +1,16 @@
 """Tests for knapsack problem tools."""
 
+import itertools
 from unittest.mock import MagicMock, patch
 
-from mcp_optimizer.tools.knapsack import register_knapsack_tools, solve_knapsack_problem
+import pytest
+
+from mcp_optimizer.tools.knapsack import (
+    _scale_for_solver,
+    knapsack_cache_info,
+    register_knapsack_tools,
+    solve_knapsack_problem,
+)
 
 
 class TestKnapsackTools:
@@ -63,7 +71,7 @@ class TestKnapsackTools:
         assert result["status"] in ["optimal", "infeasible"]
         assert "solver_info" in result
         if result["status"] == "optimal":
-            assert result["solver_info"]["algorithm"] == "Branch and Bound"
+            assert result["solver_info"]["algorithm"] == "Dynamic Programming (weight and volume)"
 
     def test_solve_knapsack_problem_large_items(self):
         """Test knapsack where all items are larger than capacity."""
@@ -169,7 +177,10 @@ class TestKnapsackTools:
 
     def test_solve_knapsack_problem_no_feasible_solution(self):
         """Test knapsack with no feasible solution."""
-        with patch("ortools.algorithms.python.knapsack_solver.KnapsackSolver") as mock_solver_class:
+        with (
+            patch("mcp_optimizer.tools.knapsack.settings.knapsack_cache", False),
+            patch("ortools.algorithms.python.knapsack_solver.KnapsackSolver") as mock_solver_class,
+        ):
             mock_solver = MagicMock()
             mock_solver.solve.return_value = 0  # No solution found
             mock_solver_class.return_value = mock_solver
@@ -183,6 +194,29 @@ class TestKnapsackTools:
             assert result["total_value"] == 0.0
             assert result["selected_items"] == []
 
+    @pytest.mark.parametrize(
+        ("computed_value", "status"),
+        [(10000, "feasible"), (0, "time_limit")],
+    )
+    def test_time_limited_solution_is_not_optimal(self, computed_value, status):
+        """Test a solve stopped by the time limit is not reported as optimal."""
+        with (
+            patch("mcp_optimizer.tools.knapsack.settings.knapsack_cache", False),
+            patch("ortools.algorithms.python.knapsack_solver.KnapsackSolver") as mock_solver_class,
+        ):
+            mock_solver = MagicMock()
+            mock_solver.solve.return_value = computed_value
+            mock_solver.is_solution_optimal.return_value = False
+            mock_solver.best_solution_contains.return_value = True
+            mock_solver_class.return_value = mock_solver
+
+            items = [{"name": "item1", "value": 10, "weight": 5}]
+
+            result = solve_knapsack_problem(items, 10)
+
+        assert result["status"] == status
+        assert result["total_value"] == computed_value / 1000
+
     def test_solve_knapsack_problem_with_optimal_solution(self):
         """Test knapsack with optimal solution and proper item selection."""
         items = [
@@ -226,38 +260,169 @@ class TestKnapsackTools:
                 if item["total_volume"] is not None:
                     assert item["total_volume"] >= 0
 
+    def test_solve_knapsack_problem_partial_volume_data(self):
+        """Test items without volume take no volume when others have it."""
+        items = [
+            {"name": "item1", "value": 10, "weight": 5, "volume": 3},
+            {"name": "item2", "value": 8, "weight": 4},
+        ]
 
-class TestKnapsackToolsValidation:
-    """Tests for knapsack tools validation."""
+        result = solve_knapsack_problem(items, 10, volume_capacity=3)
 
-    def test_knapsack_tool_empty_items_validation(self):
-        """Test knapsack tool validation with empty items."""
-        result = solve_knapsack_problem([], 10)
-        assert result["status"] == "error"
+        assert result["status"] == "optimal"
+        assert result["total_value"] == 18.0
 
-    def test_knapsack_tool_zero_capacity_validation(self):
-        """Test knapsack tool validation with zero capacity."""
+    def test_solve_knapsack_problem_unbounded_copies(self):
+        """Test unbounded knapsack selects repeated copies of an item."""
         items = [{"name": "item1", "value": 10, "weight": 5}]
-        result = solve_knapsack_problem(items, 0)
-        assert result["status"] == "error"
 
-    def test_knapsack_tool_invalid_item_format_validation(self):
-        """Test knapsack tool validation with invalid item format."""
-        items = [42]  # Invalid item format
+        result = solve_knapsack_problem(items, 20, knapsack_type="unbounded")
+
+        assert result["status"] == "optimal"
+        assert result["total_value"] == 40.0
+        assert result["selected_items"][0]["quantity"] == 4
+
+    def test_solve_knapsack_problem_decimal_weights_are_rounded(self):
+        """Test decimal weights are scaled by rounding, not truncation."""
+        # 1.005 * 1000 == 1004.999..., which truncates to the capacity 1004
+        items = [{"name": "item1", "value": 10, "weight": 1.005}]
+
+        result = solve_knapsack_problem(items, 1.004)
+
+        assert result["selected_items"] == []
+        assert result["total_value"] == 0.0
+
+    def test_solve_knapsack_problem_duplicate_names(self):
+        """Test selected items are reported per item even when names repeat."""
+        items = [
+            {"name": "item", "value": 10, "weight": 5},
+            {"name": "item", "value": 30, "weight": 5},
+        ]
+
         result = solve_knapsack_problem(items, 10)
-        assert result["status"] == "error"
 
-    def test_knapsack_tool_missing_fields_validation(self):
-        """Test knapsack tool validation with missing item fields."""
-        items = [{"name": "item1"}]  # Missing value and weight
+        assert result["total_value"] == 40.0
+        assert [item["value"] for item in result["selected_items"]] == [10, 30]
+
+    def test_solve_knapsack_problem_capacity_is_rounded_down(self):
+        """Test the scaled capacity never admits a selection above the real capacity."""
+        items = [{"name": "item1", "value": 1, "weight": 0.002}]
+
+        result = solve_knapsack_problem(items, 0.0015)
+
+        assert result["selected_items"] == []
+        assert result["total_value"] == 0.0
+
+    def test_solve_knapsack_problem_decimal_capacity_keeps_exact_fit(self):
+        """Test a decimal capacity just below a unit after scaling still fits its weight."""
+        # 0.29 * 1000 == 289.99999999999994
+        items = [{"name": "item1", "value": 1, "weight": 0.29}]
+
+        result = solve_knapsack_problem(items, 0.29)
+
+        assert result["status"] == "optimal"
+        assert result["total_value"] == 1.0
+
+    def test_scale_for_solver_keeps_integers_exact(self):
+        """Test integer quantities are scaled without a float round trip."""
+        scaled = _scale_for_solver([10**15 + 1, 3])
+
+        assert scaled.tolist() == [(10**15 + 1) * 1000, 3000]
+
+    @pytest.mark.parametrize("weight", [10**16, 1e16, 10**20])
+    def test_solve_knapsack_problem_rejects_overflowing_weights(self, weight):
+        """Test quantities that overflow int64 once scaled are rejected."""
+        items = [
+            {"name": "huge", "value": 5, "weight": weight},
+            {"name": "ok", "value": 1, "weight": 1},
+        ]
+
         result = solve_knapsack_problem(items, 10)
+
         assert result["status"] == "error"
+        assert "too large" in result["error_message"]
 
-    def test_knapsack_tool_negative_values_validation(self):
-        """Test knapsack tool validation with negative values."""
-        items = [{"name": "item1", "value": -10, "weight": 5}]
-        result = solve_knapsack_problem(items, 10)
+
+class TestKnapsackResultCache:
+    """Tests for caching of knapsack results."""
+
+    ITEMS = [
+        {"name": "cached1", "value": 60, "weight": 10, "quantity": 2},
+        {"name": "cached2", "value": 100, "weight": 20, "quantity": 1},
+    ]
+
+    def test_repeated_problem_reuses_result(self):
+        """Test a repeated problem is served from the cache."""
+        first = solve_knapsack_problem(self.ITEMS, 40)
+        hits = knapsack_cache_info().hits
+        second = solve_knapsack_problem(self.ITEMS, 40)
+
+        assert knapsack_cache_info().hits == hits + 1
+        assert second["selected_items"] == first["selected_items"]
+        assert second["execution_time"] >= 0
+
+    def test_cached_result_is_not_shared(self):
+        """Test modifying a returned result does not change later results."""
+        first = solve_knapsack_problem(self.ITEMS, 40)
+        first["selected_items"].clear()
+
+        second = solve_knapsack_problem(self.ITEMS, 40)
+
+        assert second["selected_items"]
+
+    def test_all_arguments_are_part_of_the_key(self):
+        """Test the knapsack type changes the cached result."""
+        zero_one = solve_knapsack_problem(self.ITEMS, 40)
+        bounded = solve_knapsack_problem(self.ITEMS, 40, knapsack_type="bounded")
+
+        assert zero_one["total_value"] == 160.0
+        assert bounded["total_value"] == 220.0
+
+    def test_cache_can_be_disabled(self):
+        """Test the knapsack_cache setting bypasses the cache."""
+        solve_knapsack_problem(self.ITEMS, 40)
+        cache_info = knapsack_cache_info()
+
+        with patch("mcp_optimizer.tools.knapsack.settings.knapsack_cache", False):
+            result = solve_knapsack_problem(self.ITEMS, 40)
+
+        assert result["status"] == "optimal"
+        assert knapsack_cache_info() == cache_info
+
+
+class TestKnapsackToolsValidation:
+    """Tests for knapsack tools validation."""
+
+    @pytest.mark.parametrize(
+        ("items", "capacity", "error_message"),
+        [
+            pytest.param([], 10, "No items provided", id="empty_items"),
+            pytest.param(
+                [{"name": "item1", "value": 10, "weight": 5}],
+                0,
+                "Capacity must be positive",
+                id="zero_capacity",
+            ),
+            pytest.param([42], 10, "Item 0 must be a dictionary", id="invalid_item_format"),
+            pytest.param(
+                [{"name": "item1"}],
+                10,
+                "Item 0 missing required field: value",
+                id="missing_fields",
+            ),
+            pytest.param(
+                [{"name": "item1", "value": -10, "weight": 5}],
+                10,
+                "Item 0 value and weight must be non-negative",
+                id="negative_values",
+            ),
+        ],
+    )
+    def test_knapsack_tool_validation(self, items, capacity, error_message):
+        """Test knapsack tool validation rejects invalid input."""
+        result = solve_knapsack_problem(items, capacity)
         assert result["status"] == "error"
+        assert result["error_message"] == error_message
 
 
 class TestKnapsackSolverTypes:
@@ -289,15 +454,7 @@ class TestKnapsackSolverTypes:
     def test_64items_solver(self):
         """Test solver with larger item count."""
         # Create more items to test solver behavior
-        items = []
-        for i in range(10):
-            items.append(
-                {
-                    "name": f"item{i}",
-                    "value": 10 + i,
-                    "weight": 5 + i,
-                }
-            )
+        items = [{"name": f"item{i}", "value": 10 + i, "weight": 5 + i} for i in range(10)]
         capacity = 50
 
         result = solve_knapsack_problem(items, capacity)
@@ -305,6 +462,137 @@ class TestKnapsackSolverTypes:
         assert result["status"] == "optimal"
         assert result["solver_info"]["items_count"] == 10
 
+    @pytest.mark.parametrize(
+        ("weights", "capacity", "algorithm"),
+        [
+            ([40, 25, 60, 35, 70, 45, 55, 30, 65, 50, 20, 75], 250, "Dynamic Programming"),
+            (
+                [
+                    4012.517,
+                    2531.703,
+                    6070.331,
+                    3591.127,
+                    7024.913,
+                    4558.349,
+                    5513.771,
+                    3030.119,
+                    6577.707,
+                    5092.923,
+                    2026.331,
+                    7554.137,
+                ],
+                25000,
+                "Branch and Bound (64 items)",
+            ),
+        ],
+    )
+    def test_solver_selection_is_optimal(self, weights, capacity, algorithm):
+        """Test each solver path finds the brute-force optimum."""
+        values = [52, 31, 70, 44, 81, 50, 66, 35, 73, 60, 22, 90]
+        items = [
+            {"name": f"item{i}", "value": value, "weight": weight}
+            for i, (value, weight) in enumerate(zip(values, weights, strict=True))
+        ]
+
+        result = solve_knapsack_problem(items, capacity)
+
+        best = max(
+            sum(v for v, chosen in zip(values, subset, strict=True) if chosen)
+            for subset in itertools.product([False, True], repeat=len(items))
+            if sum(w for w, chosen in zip(weights, subset, strict=True) if chosen) <= capacity
+        )
+        assert result["status"] == "optimal"
+        assert result["solver_info"]["algorithm"] == algorithm
+        assert result["total_value"] == best
+
+    @pytest.mark.parametrize(
+        ("volumes", "algorithm"),
+        [
+            (
+                [12, 30, 18, 25, 9, 40, 22, 15, 35, 28, 10, 33],
+                "Dynamic Programming (weight and volume)",
+            ),
+            (
+                [
+                    12.513,
+                    30.257,
+                    18.121,
+                    25.749,
+                    9.371,
+                    40.503,
+                    22.251,
+                    15.627,
+                    35.509,
+                    28.743,
+                    10.129,
+                    33.257,
+                ],
+                "Branch and Bound",
+            ),
+        ],
+    )
+    def test_volume_solver_selection_is_optimal(self, volumes, algorithm):
+        """Test each weight and volume solver path finds the brute-force optimum."""
+        values = [52, 31, 70, 44, 81, 50, 66, 35, 73, 60, 22, 90]
+        weights = [40, 25, 60, 35, 70, 45, 55, 30, 65, 50, 20, 75]
+        items = [
+            {"name": f"item{i}", "value": value, "weight": weight, "volume": volume}
+            for i, (value, weight, volume) in enumerate(zip(values, weights, volumes, strict=True))
+        ]
+        capacity = 250
+        volume_capacity = 100
+
+        result = solve_knapsack_problem(items, capacity, volume_capacity=volume_capacity)
+
+        best = max(
+            sum(v for v, chosen in zip(values, subset, strict=True) if chosen)
+            for subset in itertools.product([False, True], repeat=len(items))
+            if sum(w for w, chosen in zip(weights, subset, strict=True) if chosen) <= capacity
+            and sum(v for v, chosen in zip(volumes, subset, strict=True) if chosen)
+            <= volume_capacity
+        )
+        assert result["status"] == "optimal"
+        assert result["solver_info"]["algorithm"] == algorithm
+        assert result["total_value"] == best
+        assert sum(item["total_volume"] for item in result["selected_items"]) <= volume_capacity
+
+    def test_large_volume_table_uses_branch_and_bound(self):
+        """Test the weight and volume DP is skipped when its value table is too large."""
+        items = [
+            {"name": "item1", "value": 1, "weight": 1.001, "volume": 1.003},
+            {"name": "item2", "value": 2, "weight": 1.002, "volume": 1.004},
+        ]
+
+        result = solve_knapsack_problem(items, 3.998, volume_capacity=3.998)
+
+        assert result["status"] == "optimal"
+        assert result["solver_info"]["algorithm"] == "Branch and Bound"
+        assert result["total_value"] == 3.0
+
+    def test_negative_volume_capacity_is_infeasible(self):
+        """Test a negative volume capacity yields no selection instead of an error."""
+        items = [{"name": "item1", "value": 10, "weight": 5, "volume": 3}]
+
+        result = solve_knapsack_problem(items, 10, volume_capacity=-5)
+
+        assert result["status"] == "infeasible"
+        assert result["selected_items"] == []
+
+    def test_many_items_use_branch_and_bound(self):
+        """Test problems beyond the DP and 64-item limits use generic branch and bound."""
+        items = [
+            {"name": f"item{i}", "value": 10 + i % 7, "weight": 5123.457 + 1000 * (i % 11)}
+            for i in range(80)
+        ]
+        capacity = 300000
+
+        result = solve_knapsack_problem(items, capacity)
+
+        assert result["status"] == "optimal"
+        assert result["solver_info"]["algorithm"] == "Branch and Bound"
+        total_weight = sum(item["total_weight"] for item in result["selected_items"])
+        assert total_weight <= capacity
+
 
 class TestRegisterKnapsackTools:
     """Tests for knapsack tools registration."""
@@ -0,0 +1,22 @@
+"""Tests for solver input cache keys."""
+
+import math
+
+from mcp_optimizer.utils.cache_key import canonical_json
+
+
+class TestCanonicalJson:
+    """Tests for canonical JSON cache keys."""
+
+    def test_key_order_does_not_matter(self):
+        """Test dictionaries with the same content give the same key."""
+        assert canonical_json({"a": 1, "b": [1, 2]}) == canonical_json({"b": [1, 2], "a": 1})
+
+    def test_int_and_float_keys_differ(self):
+        """Test numbers keep their JSON type in the key."""
+        assert canonical_json({"a": 1}) != canonical_json({"a": 1.5})
+
+    def test_non_json_data_is_not_cacheable(self):
+        """Test objects and NaN cannot be used as cache keys."""
+        assert canonical_json({"a": object()}) is None
+        assert canonical_json({"a": math.nan}) is None
@@ -0,0 +1,99 @@
+"""Tests for structured log formatting."""
+
+import json
+import logging
+import sys
+from unittest.mock import patch
+
+from mcp_optimizer.utils.log_format import CachedTimeFormatter, JsonFormatter
+
+
+def make_record(message: str, *args, exc_info=None) -> logging.LogRecord:
+    """Create a log record for formatter tests."""
+    return logging.LogRecord(
+        name="mcp_optimizer.test",
+        level=logging.INFO,
+        pathname=__file__,
+        lineno=1,
+        msg=message,
+        args=args,
+        exc_info=exc_info,
+    )
+
+
+class TestJsonFormatter:
+    """Tests for JsonFormatter class."""
+
+    def test_format_fields(self):
+        """Test that records are emitted with the expected JSON fields."""
+        formatter = JsonFormatter()
+
+        data = json.loads(formatter.format(make_record("Solved %s in %d ms", "lp", 12)))
+
+        assert data["level"] == "INFO"
+        assert data["module"] == "mcp_optimizer.test"
+        assert data["message"] == "Solved lp in 12 ms"
+        assert "T" in data["timestamp"]
+        assert "exception" not in data
+
+    def test_format_escapes_special_characters(self):
+        """Test that quotes, backslashes and newlines stay valid JSON."""
+        formatter = JsonFormatter()
+        message = 'bad "input"\nwith \\ path'
+
+        output = formatter.format(make_record(message))
+
+        assert "\n" not in output
+        assert json.loads(output)["message"] == message
+
+    def test_format_includes_exception(self):
+        """Test that exception tracebacks are included."""
+        formatter = JsonFormatter()
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            record = make_record("failed", exc_info=sys.exc_info())
+
+        data = json.loads(formatter.format(record))
+
+        assert "ValueError: boom" in data["exception"]
+
+    def test_format_without_orjson(self):
+        """Test the standard library fallback encoder."""
+        with patch("mcp_optimizer.utils.log_format.ORJSON_AVAILABLE", False):
+            formatter = JsonFormatter()
+
+        data = json.loads(formatter.format(make_record("café")))
+
+        assert data["message"] == "café"
+
+
+class TestCachedTimeFormatter:
+    """Tests for CachedTimeFormatter class."""
+
+    def test_matches_standard_formatter(self):
+        """Test that output matches logging.Formatter for the same format."""
+        fmt = "%(asctime)s - %(name)s - %(message)s"
+        record = make_record("hello")
+
+        for datefmt in ("%Y-%m-%d %H:%M:%S", None):
+            expected = logging.Formatter(fmt, datefmt=datefmt).format(record)
+            assert CachedTimeFormatter(fmt, datefmt=datefmt).format(record) == expected
+
+    def test_reuses_timestamp_within_second(self):
+        """Test that strftime runs once per second."""
+        formatter = CachedTimeFormatter(datefmt="%H:%M:%S")
+        first = make_record("a")
+        second = make_record("b")
+        later = make_record("c")
+        first.created = 1000.1
+        second.created = 1000.9
+        later.created = 1001.0
+
+        with patch("mcp_optimizer.utils.log_format.time.strftime", return_value="t") as strftime:
+            formatter.formatTime(first, formatter.datefmt)
+            formatter.formatTime(second, formatter.datefmt)
+            assert strftime.call_count == 1
+
+            formatter.formatTime(later, formatter.datefmt)
+            assert strftime.call_count == 2
@@ -0,0 +1,134 @@
+"""Tests for buffered log output."""
+
+import io
+import logging
+import os
+import sys
+import time
+
+import pytest
+
+from mcp_optimizer.utils.log_handler import BufferedStderrHandler
+
+
+@pytest.fixture
+def pipe():
+    """Provide a non-blocking pipe to capture handler output."""
+    read_fd, write_fd = os.pipe()
+    os.set_blocking(read_fd, False)
+    yield read_fd, write_fd
+    os.close(read_fd)
+    os.close(write_fd)
+
+
+def read_available(fd: int) -> bytes:
+    """Read whatever is currently available on a non-blocking fd."""
+    try:
+        return os.read(fd, 1 << 20)
+    except BlockingIOError:
+        return b""
+
+
+def make_record(message: str, level: int = logging.INFO) -> logging.LogRecord:
+    """Create a log record for handler tests."""
+    return logging.LogRecord("test", level, __file__, 1, message, None, None)
+
+
+class TestBufferedStderrHandler:
+    """Tests for BufferedStderrHandler class."""
+
+    def test_records_are_buffered_until_flush(self, pipe):
+        """Test that records are held until flushed."""
+        read_fd, write_fd = pipe
+        handler = BufferedStderrHandler(write_fd, flush_interval=60.0)
+
+        handler.emit(make_record("first"))
+        handler.emit(make_record("second"))
+        assert read_available(read_fd) == b""
+
+        handler.flush()
+        assert read_available(read_fd) == b"first\nsecond\n"
+        handler.close()
+
+    def test_background_flush_after_interval(self, pipe):
+        """Test that the flusher thread writes pending records."""
+        read_fd, write_fd = pipe
+        handler = BufferedStderrHandler(write_fd, flush_interval=0.001)
+
+        handler.emit(make_record("hello"))
+
+        output = b""
+        deadline = time.monotonic() + 2.0
+        while not output and time.monotonic() < deadline:
+            time.sleep(0.005)
+            output = read_available(read_fd)
+
+        assert output == b"hello\n"
+        handler.close()
+
+    def test_buffer_limit_triggers_write(self, pipe):
+        """Test that a full buffer is written without waiting."""
+        read_fd, write_fd = pipe
+        handler = BufferedStderrHandler(write_fd, flush_interval=60.0, max_buffer_bytes=8)
+
+        handler.emit(make_record("0123456789"))
+
+        assert read_available(read_fd) == b"0123456789\n"
+        handler.close()
+
+    def test_error_records_written_immediately(self, pipe):
+        """Test that errors are not held in the buffer."""
+        read_fd, write_fd = pipe
+        handler = BufferedStderrHandler(write_fd, flush_interval=60.0)
+
+        handler.emit(make_record("info"))
+        handler.emit(make_record("failure", logging.ERROR))
+
+        assert read_available(read_fd) == b"info\nfailure\n"
+        handler.close()
+
+    def test_close_flushes(self, pipe):
+        """Test that closing the handler writes remaining records."""
+        read_fd, write_fd = pipe
+        handler = BufferedStderrHandler(write_fd, flush_interval=60.0)
+
+        handler.emit(make_record("last words"))
+        handler.close()
+
+        assert read_available(read_fd) == b"last words\n"
+
+    def test_broken_pipe_is_ignored(self):
+        """Test that write errors do not propagate to callers."""
+        read_fd, write_fd = os.pipe()
+        os.close(read_fd)
+        handler = BufferedStderrHandler(write_fd, flush_interval=60.0)
+
+        try:
+            handler.emit(make_record("dropped", logging.ERROR))
+            handler.close()
+        finally:
+            os.close(write_fd)
+
+    def test_records_after_close_are_written(self, pipe):
+        """Test that records emitted after close are not left in the buffer."""
+        read_fd, write_fd = pipe
+        handler = BufferedStderrHandler(write_fd, flush_interval=60.0)
+        handler.close()
+
+        handler.emit(make_record("late"))
+
+        assert read_available(read_fd) == b"late\n"
+
+    def test_closed_descriptor_falls_back_to_sys_stderr(self, monkeypatch):
+        """Test that records go to sys.stderr when the descriptor is not open."""
+        read_fd, write_fd = os.pipe()
+        os.close(read_fd)
+        os.close(write_fd)
+        stream = io.StringIO()
+        monkeypatch.setattr(sys, "stderr", stream)
+        handler = BufferedStderrHandler(write_fd, flush_interval=60.0)
+
+        handler.emit(make_record("fallback", logging.ERROR))
+        handler.close()
+
+        assert stream.getvalue() == "fallback\n"